@@ -1 +1,7 @@
 """Asha Transcription Service API."""
+
+from dotenv import find_dotenv, load_dotenv
+
+# Load .env once at package import; individual modules used to re-run the
+# find_dotenv directory walk and re-parse the file on every import chain
+load_dotenv(find_dotenv(usecwd=True), override=False)
@@ -41,6 +41,14 @@ class Settings(BaseSettings):
         default="https://openrouter.ai/api/v1/completions",
         description="Endpoint URL for SOAP note generation service",
     )
+    SOAP_MAX_CONCURRENCY: int = Field(
+        default=5,
+        description="Maximum number of SOAP note generations running concurrently"
+    )
+    MOCK_SOAP_LATENCY: float = Field(
+        default=0.0,
+        description="Simulated latency in seconds for the mock SOAP processor"
+    )
 
     # Logging settings
     LOG_LEVEL: str = Field(
@@ -8,7 +8,10 @@ import asyncio
 
 # Import application components
 from app.store.dispatcher import start_dispatcher, stop_dispatcher
+from app.store.storage import get_transcript_store
 from app.database import init_db
+from app.transcription import deepgram
+from app.transcription.factory import aclose_services
 from app.config import get_settings, Settings
 
 # Import routers
@@ -55,14 +58,24 @@ async def startup_event():
     await start_dispatcher()
     logger.info("Transcript dispatcher started!")
 
+    # Start the in-memory store's background purge loop
+    await get_transcript_store().start_purge_loop()
+
 
 @app.on_event("shutdown")
 async def shutdown_event():
+    # Stop the background purge loop
+    await get_transcript_store().stop_purge_loop()
+
     # Stop the transcript dispatcher
     logger.info("Stopping transcript dispatcher...")
     await stop_dispatcher()
     logger.info("Transcript dispatcher stopped!")
 
+    # Close shared HTTP clients
+    await deepgram.aclose_client()
+    await aclose_services()
+
 
 @app.get("/")
 async def root():
@@ -86,4 +99,4 @@ async def root():
         "streaming_enabled": settings.USE_STREAMING_TRANSCRIPTION
     }
 
-print("FastAPI app created and configured. To run the server use: uvicorn app.main:app --reload")
+print("FastAPI app created and configured. To run the server use: uvicorn app.main:app --loop uvloop --reload")
@@ -25,6 +25,10 @@ class Transcript(Base):
 
 class SOAPNote(Base):
     __tablename__ = "soap_notes"
+    # Composite index so "latest SOAP note for a session" is an index seek
+    __table_args__ = (
+        sa.Index("ix_soap_notes_session_id_created_at", "session_id", sa.desc("created_at")),
+    )
     id = sa.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     session_id = sa.Column(UUID(as_uuid=True), sa.ForeignKey("sessions.id"), index=True)
     soap_text = sa.Column(sa.Text)
@@ -17,21 +17,21 @@ router = APIRouter(
 
 
 @router.post("/{session_id}/soap", response_model=SOAPNoteResponse)
-async def create_soap_note(session_id: str, request: SOAPNoteRequest = None):
+async def create_soap_note(session_id: uuid.UUID, request: SOAPNoteRequest = None):
     """
     Generate a SOAP note for a specific session.
-    
+
     Args:
         session_id: The session ID to generate a SOAP note for
         request: Optional request body with SOAP processor provider
-        
+
     Returns:
         The generated SOAP note
     """
+    # The path converter validates and parses the UUID once at the boundary
+    session_uuid = session_id
+    session_id = str(session_uuid)
     try:
-        # Validate the session_id as UUID
-        session_uuid = uuid.UUID(session_id)
-        
         # Check if session exists
         async with async_session() as session:
             import sqlalchemy as sa
@@ -60,7 +60,7 @@ async def create_soap_note(session_id: str, request: SOAPNoteRequest = None):
         try:
             # Process and store the SOAP note
             # asyncio.sleep(10)
-            soap_note = await process_and_store_soap_note(str(session_uuid), provider=provider)
+            soap_note = await process_and_store_soap_note(session_uuid, provider=provider)
             
             # Send success notification
             await send_soap_notification(
@@ -84,8 +84,7 @@ async def create_soap_note(session_id: str, request: SOAPNoteRequest = None):
             raise
             
     except ValueError as e:
-        if "invalid literal for UUID" in str(e):
-            raise HTTPException(status_code=400, detail=f"Invalid session ID format: {session_id}")
+        # Raised when no transcripts exist for the session
         logger.error(f"Failed to create SOAP note for session {session_id}: {e}")
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
@@ -94,20 +93,20 @@ async def create_soap_note(session_id: str, request: SOAPNoteRequest = None):
 
 
 @router.get("/{session_id}/soap", response_model=SOAPNoteResponse)
-async def get_soap_note(session_id: str):
+async def get_soap_note(session_id: uuid.UUID):
     """
     Get the SOAP note for a specific session.
-    
+
     Args:
         session_id: The session ID to get the SOAP note for
-        
+
     Returns:
         The SOAP note if found
     """
+    # The path converter validates and parses the UUID once at the boundary
+    session_uuid = session_id
+    session_id = str(session_uuid)
     try:
-        # Validate the session_id as UUID
-        session_uuid = uuid.UUID(session_id)
-        
         # Check if session exists
         async with async_session() as session:
             import sqlalchemy as sa
@@ -120,18 +119,16 @@ async def get_soap_note(session_id: str):
             if not db_session:
                 raise HTTPException(status_code=404, detail=f"Session {session_id} not found")
         
-        soap_note = await get_soap_note_for_session(str(session_uuid))
-        
+        soap_note = await get_soap_note_for_session(session_uuid)
+
         if not soap_note:
             raise HTTPException(status_code=404, detail=f"No SOAP note found for session {session_id}")
-        
+
         return SOAPNoteResponse(
             session_id=str(soap_note.session_id),
             soap_text=soap_note.soap_text,
             created_at=soap_note.created_at.isoformat()
         )
-    except ValueError:
-        raise HTTPException(status_code=400, detail=f"Invalid session ID format: {session_id}")
     except HTTPException as http_exc:
         # Re-raise HTTP exceptions with their original status code
         logger.error(f"HTTP error for session {session_id}: {http_exc}")
@@ -1,3 +1,4 @@
+from datetime import datetime
 from fastapi import APIRouter, HTTPException, Depends
 from loguru import logger
 
@@ -128,7 +129,7 @@ async def get_session_transcripts_v2(session_id: str):
                     ],
                     "speakers": record.speakers,
                     "status": record.status,
-                    "created_at": record.created_at.isoformat()
+                    "created_at": datetime.utcfromtimestamp(record.created_at).isoformat()
                 }
                 for record in transcripts
             ]
@@ -2,6 +2,7 @@ import uuid
 import json
 import time
 from typing import Dict, Any
+import pybase64
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends
 from loguru import logger
 import sqlalchemy as sa
@@ -151,6 +152,29 @@ async def websocket_endpoint(websocket: WebSocket, session_id: str, settings: Se
                 "message": "Connected to batch transcription service",
                 "streaming": False
             })
+            
+            # Shared by the JSON and binary batch paths below
+            async def process_batch_chunk(serial: int, audio_data: str, service) -> None:
+                """Transcribe one chunk, record the result and ack the client."""
+                transcript_data = await service.transcribe(audio_data)
+                logger.info(f"Session {session_id}: Transcribed chunk {serial}: {transcript_data}")
+                
+                # Store the interim result with its serial number in legacy in-memory dict
+                interim_transcripts[session_id][serial] = transcript_data.get("text", "")
+                
+                # Store in the new thread-safe in-memory store
+                await transcript_store.add_transcript(
+                    session_id=session_id,
+                    serial=serial,
+                    transcript_data=transcript_data
+                )
+                
+                # Send acknowledgment back to client
+                await websocket.send_json({
+                    "status": "success",
+                    "serial": serial,
+                    "transcript": transcript_data.get("text", "")
+                })
 
         # Main WebSocket processing loop
         while True:
@@ -207,38 +231,29 @@ async def websocket_endpoint(websocket: WebSocket, session_id: str, settings: Se
                                 except ValueError as e:
                                     logger.error(f"Invalid provider requested: {provider}, using default")
                             
-                            # Process the transcription asynchronously
-                            transcript_data = await transcription_service.transcribe(audio_data)
-                            logger.info(f"Session {session_id}: Transcribed chunk {serial}: {transcript_data}")
-                            
-                            # Store the interim result with its serial number in legacy in-memory dict
-                            interim_transcripts[session_id][serial] = transcript_data.get("text", "")
-                            
-                            # Store in the new thread-safe in-memory store
-                            await transcript_store.add_transcript(
-                                session_id=session_id,
-                                serial=serial,
-                                transcript_data=transcript_data
-                            )
-                            
-                            # Send acknowledgment back to client
-                            await websocket.send_json({
-                                "status": "success",
-                                "serial": serial,
-                                "transcript": transcript_data.get("text", "")
-                            })
+                            await process_batch_chunk(serial, audio_data, transcription_service)
                             
                     except json.JSONDecodeError as e:
                         logger.error(f"Session {session_id}: Failed to parse JSON message: {e}")
                         continue
                         
-                elif "bytes" in message and use_streaming:
-                    # It's binary data for streaming mode
+                elif "bytes" in message:
                     audio_bytes = message["bytes"]
                     
-                    # Send to the streaming service
-                    if stream_service:
-                        await stream_service.send_audio(audio_bytes)
+                    if use_streaming:
+                        # It's binary data for streaming mode
+                        if stream_service:
+                            await stream_service.send_audio(audio_bytes)
+                    else:
+                        # Batch-mode binary frame: 4-byte big-endian serial
+                        # followed by raw WAV bytes. Avoids the ~33% base64
+                        # inflation and JSON parsing on the wire; the
+                        # transcription services still take base64, so encode
+                        # once here with the SIMD codec
+                        serial = int.from_bytes(audio_bytes[:4], "big")
+                        logger.info(f"Session {session_id}: Received binary chunk {serial}.")
+                        audio_data = pybase64.b64encode(memoryview(audio_bytes)[4:]).decode("ascii")
+                        await process_batch_chunk(serial, audio_data, transcription_service)
                 
             except Exception as e:
                 logger.error(f"Session {session_id}: Error processing message: {e}")
@@ -249,14 +264,18 @@ async def websocket_endpoint(websocket: WebSocket, session_id: str, settings: Se
 
     except WebSocketDisconnect:
         logger.info(f"Session {session_id} disconnected.")
-        
+
         # Clean up streaming resources if necessary
         if session_id in active_streams:
             logger.info(f"Session {session_id}: Cleaning up streaming resources")
             await active_streams[session_id].close()
             del active_streams[session_id]
-        
-        # Schedule SOAP note generation to run in the background 
+
+        # The producer is done: mark the session complete so readers know an
+        # empty in-memory result means "dispatched and evicted", not "pending"
+        await get_transcript_store().mark_session_complete(session_id)
+
+        # Schedule SOAP note generation to run in the background
         schedule_soap_note_generation(session_id, provider=soap_processor_type)
         
     except Exception as e:
@@ -277,6 +296,7 @@ async def websocket_endpoint(websocket: WebSocket, session_id: str, settings: Se
                 del active_streams[session_id]
             except Exception as cleanup_error:
                 logger.error(f"Session {session_id}: Error cleaning up streaming resources: {cleanup_error}")
-        
-        # Also schedule SOAP note generation on error cases
+
+        # Also mark the session complete and schedule SOAP note generation on error cases
+        await get_transcript_store().mark_session_complete(session_id)
         schedule_soap_note_generation(session_id, provider=soap_processor_type) 
\ No newline at end of file
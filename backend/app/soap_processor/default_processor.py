@@ -1,33 +1,48 @@
 import httpx
 import asyncio
+import orjson
+import random
+import string
+from pathlib import Path
+from typing import Optional
 from loguru import logger
 from .base import BaseSOAPProcessor
 
+# HTTP status codes worth retrying (rate limits and transient server errors)
+RETRYABLE_STATUS_CODES = {408, 409, 425, 429, 500, 502, 503, 504}
+
+# Prompt template loaded once at import; edit the file to hot-swap the prompt
+_PROMPT_PATH = Path(__file__).parent / "prompts" / "soap_default.txt"
+PROMPT = string.Template(_PROMPT_PATH.read_text(encoding="utf-8"))
+
+# Shared client so retries and subsequent calls reuse the same TLS session
+_shared_client: Optional[httpx.AsyncClient] = None
+
+def _get_client() -> httpx.AsyncClient:
+    """Lazily create the shared HTTP client for SOAP note generation."""
+    global _shared_client
+    if _shared_client is None:
+        _shared_client = httpx.AsyncClient(timeout=60.0)
+    return _shared_client
+
 class DefaultSOAPProcessor(BaseSOAPProcessor):
-    def __init__(self, endpoint: str, api_key: str):
+    def __init__(
+        self,
+        endpoint: str,
+        api_key: str,
+        max_retries: int = 3,
+        retry_delay_seconds: float = 1.0,
+        retry_jitter_seconds: float = 1.0,
+    ):
         self.endpoint = endpoint
         self.api_key = api_key
+        self.max_retries = max_retries
+        self.retry_delay_seconds = retry_delay_seconds
+        self.retry_jitter_seconds = retry_jitter_seconds
 
     async def process(self, transcript_text: str) -> str:
-        # Build a generic prompt for SOAP note generation
-        prompt = f"""
-        You are a large language model trained to generate clinical notes. Your task is to **create a structured SOAP note in HTML format** based on the following transcript of a patient encounter. The SOAP note must adhere to these requirements:
-
-        - **Sections:** Include exactly **four sections**: **Subjective, Objective, Assessment,** and **Plan**. Use these as section headings (for example, as `<h2>` or `<h3>` tags in HTML). Each section should appear in the note even if the transcript has no information for that section (in such a case, include a placeholder bullet like "No relevant information.").  
-        - **Bullet Points:** Under each section, provide the content as bullet points. Use an unordered list (`<ul>`) for each section’s bullet points, and each individual point should be in an `<li>` element. Each bullet point should capture a single relevant piece of information from the transcript for that section. Keep bullet point statements **concise** and **factual**.  
-        - **Use of Transcript Evidence:** For **each bullet point**, include a `<span>` tag around the bullet text. In that `<span>`, add a **`title` attribute** that contains the exact excerpt(s) from the transcript which support that bullet point. This will serve as a tooltip showing evidence from the transcript. Follow these rules for the excerpts in the `title` attribute:  
-        - Use **one or more short excerpts** from the transcript that are relevant to the bullet point’s content. (If the bullet is derived from multiple separate parts of the conversation, you may include more than one excerpt in the title attribute, separated by a space or semicolon.)  
-        - **Limit each excerpt to 50 characters or fewer.** If an excerpt is longer than 50 characters, truncate it at a natural break within 80 characters and end it with an ellipsis (`…`).  
-        - **Accuracy:** Use the exact words from the transcript for each excerpt (verbatim, aside from truncation). Do not paraphrase inside the `title` attribute – it should reflect the transcript exactly. However, feel free to paraphrase or summarize in the visible bullet text outside the title attribute.  
-        - **No Transcript in Output:** Do not include the full transcript or any large portion of it in the output. Use the transcript only to extract the necessary details. The only place transcript text should appear in the output is within the `title` attributes of the spans as evidence snippets.  
-        - **Output Format:** **Return only the HTML content** of the SOAP note, with no additional commentary, explanation, or markdown formatting. The output should begin with the first section’s heading (e.g., `<h2>Subjective</h2>`) and end with the closing tag of the last section’s list. Do not include any preliminary text, and do not wrap the HTML in a markdown code block. Ensure that all HTML tags are properly closed and nested.
-
-        **Transcript:**  
-        ```{transcript_text}```  
-
-        *Use that transcript to inform the SOAP note. Remember: only output the formatted HTML SOAP note as the final answer.*
-                
-        """
+        # Render the pre-compiled prompt template with the transcript
+        prompt = PROMPT.substitute(transcript=transcript_text)
         headers = {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
@@ -37,15 +52,51 @@ class DefaultSOAPProcessor(BaseSOAPProcessor):
             "prompt": prompt,
             "max_tokens": 500,  # Adjust as needed
         }
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(self.endpoint, json=data, headers=headers)
+
+        client = _get_client()
+        last_error = None
+
+        for attempt in range(self.max_retries):
+            try:
+                # orjson serializes straight to bytes, skipping httpx's json.dumps step
+                response = await client.post(self.endpoint, content=orjson.dumps(data), headers=headers)
                 response.raise_for_status()
                 result = response.json()
                 # Assume the SOAP note is returned in result["choices"][0]["text"]
                 soap_text = result["choices"][0]["text"].strip()
                 logger.info("SOAP note generated successfully.")
                 return soap_text
-        except Exception as e:
-            logger.error(f"Error generating SOAP note: {e}")
-            raise e 
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code not in RETRYABLE_STATUS_CODES:
+                    logger.error(f"Error generating SOAP note: {e}")
+                    raise
+                last_error = e
+                wait_time = self._retry_wait(attempt, e.response)
+            except httpx.TransportError as e:
+                last_error = e
+                wait_time = self._retry_wait(attempt)
+            except Exception as e:
+                logger.error(f"Error generating SOAP note: {e}")
+                raise
+
+            if attempt < self.max_retries - 1:
+                logger.warning(
+                    f"Transient error generating SOAP note (attempt {attempt+1}/{self.max_retries}): "
+                    f"{last_error}. Retrying in {wait_time:.1f} seconds..."
+                )
+                await asyncio.sleep(wait_time)
+
+        logger.error(f"Error generating SOAP note after {self.max_retries} attempts: {last_error}")
+        raise last_error
+
+    def _retry_wait(self, attempt: int, response: Optional[httpx.Response] = None) -> float:
+        """Compute the backoff delay for a retry, honoring Retry-After when present."""
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after:
+                try:
+                    return float(retry_after)
+                except ValueError:
+                    pass
+        # Exponential backoff with jitter, same pattern as the transcript dispatcher
+        return self.retry_delay_seconds * (2 ** attempt) + random.random() * self.retry_jitter_seconds
@@ -37,6 +37,10 @@ def get_soap_processor(provider: str = "default", **kwargs) -> BaseSOAPProcessor
     if provider == "default":
         return DefaultSOAPProcessor(endpoint=endpoint, api_key=api_key)
     elif provider == "mock":
-        return MockSOAPProcessor(endpoint=endpoint, api_key=api_key)
+        return MockSOAPProcessor(
+            endpoint=endpoint,
+            api_key=api_key,
+            simulated_latency=settings.MOCK_SOAP_LATENCY,
+        )
     else:
         raise ValueError(f"Unknown SOAP processor provider: {provider}") 
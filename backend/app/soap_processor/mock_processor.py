@@ -7,16 +7,18 @@ class MockSOAPProcessor(BaseSOAPProcessor):
     A mock SOAP processor for testing purposes.
     Generates a simple SOAP note without making external API calls.
     """
-    def __init__(self, endpoint: str = None, api_key: str = None):
+    def __init__(self, endpoint: str = None, api_key: str = None, simulated_latency: float = 0.0):
         """
         Initialize the mock SOAP processor.
-        
+
         Args:
             endpoint: Ignored in mock implementation
             api_key: Ignored in mock implementation
+            simulated_latency: Seconds to sleep per call to simulate an API round-trip
         """
         self.endpoint = endpoint
         self.api_key = api_key
+        self.simulated_latency = simulated_latency
     
     async def process(self, transcript_text: str) -> str:
         """
@@ -35,8 +37,9 @@ class MockSOAPProcessor(BaseSOAPProcessor):
         words = transcript_text.split()
         word_count = len(words)
         
-        # Use a small delay to simulate API call
-        await asyncio.sleep(0.5)
+        # Optionally simulate API latency (0 by default so tests don't pay for it)
+        if self.simulated_latency > 0:
+            await asyncio.sleep(self.simulated_latency)
         
         # Generate a simple SOAP note
         soap_note = f"""
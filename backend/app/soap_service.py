@@ -1,5 +1,5 @@
 import asyncio
-from typing import Dict, Optional, List, Any
+from typing import Dict, Optional, List, Any, Union
 from loguru import logger
 import sqlalchemy as sa
 from sqlalchemy.future import select
@@ -15,112 +15,125 @@ from .notification.service import send_soap_notification
 # Get application settings
 settings = get_settings()
 
-async def process_and_store_soap_note(session_id: str, provider: str = "default") -> SOAPNote:
+# Bound the number of SOAP notes generated concurrently so fanout
+# (e.g. backfill jobs) doesn't overwhelm the LLM provider
+_soap_semaphore = asyncio.Semaphore(settings.SOAP_MAX_CONCURRENCY)
+
+def _as_uuid(session_id: Union[str, uuid.UUID]) -> uuid.UUID:
+    """Convert a session ID to a UUID, skipping the parse when it already is one."""
+    return session_id if isinstance(session_id, uuid.UUID) else uuid.UUID(session_id)
+
+
+async def process_and_store_soap_note(session_id: Union[str, uuid.UUID], provider: str = "default") -> SOAPNote:
     """
     Process transcripts for a session and generate a SOAP note.
-    
+
     Args:
-        session_id: The session ID to process
+        session_id: The session ID to process (string or UUID)
         provider: The SOAP processor provider to use
-        
+
     Returns:
         The created SOAPNote object
-        
+
     Raises:
         ValueError: If no transcripts are found for the session
     """
-    try:
-        # Convert session_id to UUID
-        session_uuid = uuid.UUID(session_id)
-        
-        # 1. Retrieve transcript text using the in-memory store first
-        transcript_store = get_transcript_store()
-        transcript_records = await transcript_store.get_transcripts_for_session(session_id)
-        
-        # If no transcripts in memory, try the database
-        if not transcript_records:
-            logger.info(f"No transcripts found in memory for session {session_id}, checking database")
-            async with async_session() as session:
-                result = await session.execute(
-                    select(Transcript)
-                    .filter(Transcript.session_id == session_uuid)
-                    .order_by(Transcript.serial)
-                )
-                db_transcripts = result.scalars().all()
-                
-                if not db_transcripts:
-                    logger.error(f"No transcripts found for session {session_id}")
-                    raise ValueError(f"No transcripts found for session {session_id}")
-                
-                # Convert DB transcripts to text
-                transcript_text = "\n".join([t.transcript for t in db_transcripts])
-        else:
-            # Order transcripts by serial number and convert to text
-            transcript_text = "\n".join([record.transcript for record in transcript_records])
-        
-        if not transcript_text:
-            logger.error(f"Empty transcript text for session {session_id}")
-            raise ValueError(f"Empty transcript text for session {session_id}")
-            
-        logger.info(f"Retrieved transcripts for session {session_id}, generating SOAP note")
-        
-        # 2. Generate SOAP note using the SOAP processor
-        soap_processor = get_soap_processor(
-            provider=provider,
-            endpoint=settings.SOAP_API_ENDPOINT,
-            api_key=settings.SOAP_API_KEY
-        )
-        try:
-            soap_text = await soap_processor.process(transcript_text)
-        except Exception as e:
-            logger.error(f"Failed to generate SOAP note for session {session_id}: {e}")
-            raise
-        
-        # 3. Store the SOAP note in the database
+    session_uuid = _as_uuid(session_id)
+    # The WebSocket path keys the in-memory store by the raw /ws/{session_id}
+    # path string, so keep the caller's form for store lookups; the canonical
+    # str(UUID) form is only for logging and the database
+    store_key = session_id if isinstance(session_id, str) else str(session_uuid)
+    session_id = str(session_uuid)
+
+    # 1. Retrieve transcript text using the in-memory store first
+    transcript_store = get_transcript_store()
+    transcript_records = await transcript_store.get_transcripts_for_session(store_key)
+
+    # If no transcripts in memory, try the database — unless the session is
+    # still live in the store, in which case memory is authoritative and the
+    # database cannot hold anything the store hasn't seen
+    if not transcript_records:
+        if await transcript_store.is_session_live(store_key):
+            logger.error(f"No transcripts found for live session {session_id}")
+            raise ValueError(f"No transcripts found for session {session_id}")
+
+        logger.info(f"No transcripts found in memory for session {session_id}, checking database")
         async with async_session() as session:
-            new_soap = SOAPNote(
-                session_id=session_uuid,
-                soap_text=soap_text
+            # Select just the text column and feed the cursor straight into
+            # the join, skipping full ORM row hydration
+            result = await session.execute(
+                select(Transcript.transcript)
+                .filter(Transcript.session_id == session_uuid)
+                .order_by(Transcript.serial)
             )
-            session.add(new_soap)
-            await session.commit()
-            await session.refresh(new_soap)
-            
-        logger.info(f"Stored SOAP note for session {session_id}")
-        return new_soap
-    except ValueError as e:
-        if "invalid literal for UUID" in str(e):
-            logger.error(f"Invalid session ID format: {session_id}")
+            transcript_text = "\n".join(result.scalars())
+
+            if not transcript_text:
+                logger.error(f"No transcripts found for session {session_id}")
+                raise ValueError(f"No transcripts found for session {session_id}")
+    else:
+        # Order transcripts by serial number and convert to text
+        transcript_text = "\n".join(record.transcript for record in transcript_records)
+    
+    if not transcript_text:
+        logger.error(f"Empty transcript text for session {session_id}")
+        raise ValueError(f"Empty transcript text for session {session_id}")
+        
+    logger.info(f"Retrieved transcripts for session {session_id}, generating SOAP note")
+    
+    # 2. Generate SOAP note using the SOAP processor
+    soap_processor = get_soap_processor(
+        provider=provider,
+        endpoint=settings.SOAP_API_ENDPOINT,
+        api_key=settings.SOAP_API_KEY
+    )
+    try:
+        soap_text = await soap_processor.process(transcript_text)
+    except Exception as e:
+        logger.error(f"Failed to generate SOAP note for session {session_id}: {e}")
         raise
+    
+    # 3. Store the SOAP note in the database
+    async with async_session() as session:
+        new_soap = SOAPNote(
+            session_id=session_uuid,
+            soap_text=soap_text
+        )
+        session.add(new_soap)
+        await session.commit()
+        await session.refresh(new_soap)
+        
+    logger.info(f"Stored SOAP note for session {session_id}")
+    return new_soap
 
 
-async def get_soap_note_for_session(session_id: str) -> Optional[SOAPNote]:
+async def get_soap_note_for_session(session_id: Union[str, uuid.UUID]) -> Optional[SOAPNote]:
     """
     Retrieve the SOAP note for a given session.
-    
+
     Args:
-        session_id: The session ID to retrieve the SOAP note for
-        
+        session_id: The session ID to retrieve the SOAP note for (string or UUID)
+
     Returns:
         The SOAPNote object if found, None otherwise
     """
     try:
-        # Convert session_id to UUID
-        session_uuid = uuid.UUID(session_id)
-        
-        async with async_session() as session:
-            result = await session.execute(
-                select(SOAPNote)
-                .filter(SOAPNote.session_id == session_uuid)
-                .order_by(SOAPNote.created_at.desc())
-            )
-            soap_note = result.scalars().first()
-            
-        return soap_note
+        session_uuid = _as_uuid(session_id)
     except ValueError as e:
         logger.error(f"Invalid session ID format in get_soap_note_for_session: {session_id}, {e}")
         return None
 
+    async with async_session() as session:
+        result = await session.execute(
+            select(SOAPNote)
+            .filter(SOAPNote.session_id == session_uuid)
+            .order_by(SOAPNote.created_at.desc())
+            .limit(1)
+        )
+        soap_note = result.scalars().first()
+
+    return soap_note
+
 
 async def generate_soap_note_background(session_id: str, provider: str = "default"):
     """
@@ -131,9 +144,15 @@ async def generate_soap_note_background(session_id: str, provider: str = "defaul
         session_id: The session ID to generate a SOAP note for
         provider: The SOAP processor provider to use
     """
+    async with _soap_semaphore:
+        await _generate_soap_note(session_id, provider=provider)
+
+
+async def _generate_soap_note(session_id: str, provider: str = "default"):
+    """Generate a SOAP note for a session, sending progress notifications."""
     try:
         logger.info(f"Starting background SOAP note generation for session {session_id}")
-        
+
         # Optional: Send initial processing notification
         await send_soap_notification(
             session_id=session_id,
@@ -162,14 +181,37 @@ async def generate_soap_note_background(session_id: str, provider: str = "defaul
         )
 
 
+async def generate_soap_notes_for_sessions(session_ids: List[str], provider: str = "default"):
+    """
+    Generate SOAP notes for multiple sessions concurrently.
+
+    Concurrency is bounded by the shared semaphore, so this is safe to use
+    for backfill jobs over large numbers of sessions.
+
+    Args:
+        session_ids: The session IDs to generate SOAP notes for
+        provider: The SOAP processor provider to use
+    """
+    await asyncio.gather(
+        *[generate_soap_note_background(session_id, provider) for session_id in session_ids]
+    )
+
+
+# Strong references to in-flight background tasks; the event loop only keeps
+# weak references, so without this a SOAP generation could be GC'd mid-flight
+_pending_tasks: set = set()
+
+
 def schedule_soap_note_generation(session_id: str, provider: str = "default"):
     """
     Schedule a SOAP note generation task to run in the background.
-    
+
     Args:
         session_id: The session ID to generate a SOAP note for
         provider: The SOAP processor provider to use
     """
-    asyncio.create_task(
+    task = asyncio.create_task(
         generate_soap_note_background(session_id, provider)
-    ) 
\ No newline at end of file
+    )
+    _pending_tasks.add(task)
+    task.add_done_callback(_pending_tasks.discard) 
\ No newline at end of file
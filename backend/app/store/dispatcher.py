@@ -1,5 +1,6 @@
 import asyncio
 import time
+from functools import lru_cache
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 from loguru import logger
@@ -10,7 +11,12 @@ import uuid
 
 from app.database import async_session
 from app.models import Transcript
-from .storage import TranscriptRecord, TranscriptSegment, get_transcript_store
+from .storage import (
+    InMemoryTranscriptionStore,
+    TranscriptRecord,
+    TranscriptSegment,
+    get_transcript_store,
+)
 
 
 class TranscriptDispatcher:
@@ -25,13 +31,20 @@ class TranscriptDispatcher:
         batch_size: int = 3,
         max_retries: int = 3,
         retry_delay_seconds: int = 1,
+        store: Optional[InMemoryTranscriptionStore] = None,
     ):
         self.interval_seconds = interval_seconds
         self.batch_size = batch_size
         self.max_retries = max_retries
         self.retry_delay_seconds = retry_delay_seconds
+        # The store to drain; defaults to the shared singleton, but tests
+        # can inject an isolated instance
+        self.store = store if store is not None else get_transcript_store()
         self.running = False
         self.task = None
+        # Serializes _process_batch so flush_once and the background loop
+        # can't read the same pending batch and save it twice
+        self._batch_lock = asyncio.Lock()
     
     async def start(self):
         """Start the dispatcher as a background task."""
@@ -61,49 +74,71 @@ class TranscriptDispatcher:
     async def _dispatch_loop(self):
         """Main loop that periodically dispatches pending transcripts."""
         try:
+            store = self.store
             while self.running:
                 await self._process_batch()
-                # Wait before processing the next batch
-                await asyncio.sleep(self.interval_seconds)
+                # Wait until a full batch is pending or the interval elapses,
+                # so batches fill quickly under load without adding latency when idle
+                await store.wait_until(min_pending=self.batch_size, timeout=self.interval_seconds)
         except Exception as e:
             logger.exception(f"Error in transcript dispatcher loop: {str(e)}")
             self.running = False
     
-    async def _process_batch(self):
-        """Process a batch of pending transcripts."""
-        # Get the in-memory store
-        store = get_transcript_store()
-        
-        # Retrieve pending transcripts up to batch size
-        pending_transcripts = await store.get_pending_transcripts(limit=self.batch_size)
+    async def flush_once(self) -> int:
+        """
+        Synchronously drain everything currently pending, in batches.
         
-        if not pending_transcripts:
-            return  # Nothing to process
+        Lets tests force a deterministic flush instead of sleeping out the
+        dispatch interval.
         
-        logger.info(f"Dispatching {len(pending_transcripts)} transcripts to database")
+        Returns:
+            The number of transcripts dispatched
+        """
+        flushed = 0
+        while True:
+            dispatched = await self._process_batch()
+            if not dispatched:
+                return flushed
+            flushed += dispatched
+    
+    async def _process_batch(self) -> int:
+        """Process a batch of pending transcripts; returns how many were dispatched."""
+        store = self.store
         
-        # Process the batch with retries
-        for retry in range(self.max_retries):
-            try:
-                await self._save_to_database(pending_transcripts)
-                
-                # Mark all transcripts as dispatched in the in-memory store
-                for record in pending_transcripts:
-                    await store.mark_as_dispatched(record.session_id, record.serial)
-                
-                logger.info(f"Successfully dispatched {len(pending_transcripts)} transcripts to database")
-                break  # Success, exit retry loop
-                
-            except Exception as e:
-                logger.error(f"Failed to dispatch transcripts (attempt {retry+1}/{self.max_retries}): {str(e)}")
-                
-                if retry < self.max_retries - 1:
-                    # Exponential backoff for retries
-                    wait_time = self.retry_delay_seconds * (2 ** retry)
-                    logger.info(f"Retrying in {wait_time} seconds...")
-                    await asyncio.sleep(wait_time)
-                else:
-                    logger.error("Max retries reached, giving up on this batch")
+        # The pending set must not be re-read until this batch is marked
+        # dispatched, or a concurrent caller would save the same records
+        async with self._batch_lock:
+            # Retrieve pending transcripts up to batch size
+            pending_transcripts = await store.get_pending_transcripts(limit=self.batch_size)
+            
+            if not pending_transcripts:
+                return 0  # Nothing to process
+            
+            logger.info(f"Dispatching {len(pending_transcripts)} transcripts to database")
+            
+            # Process the batch with retries
+            for retry in range(self.max_retries):
+                try:
+                    await self._save_to_database(pending_transcripts)
+                    
+                    # Mark all transcripts as dispatched in the in-memory store
+                    for record in pending_transcripts:
+                        await store.mark_as_dispatched(record.session_id, record.serial)
+                    
+                    logger.info(f"Successfully dispatched {len(pending_transcripts)} transcripts to database")
+                    return len(pending_transcripts)  # Success, exit retry loop
+                    
+                except Exception as e:
+                    logger.error(f"Failed to dispatch transcripts (attempt {retry+1}/{self.max_retries}): {str(e)}")
+                    
+                    if retry < self.max_retries - 1:
+                        # Exponential backoff for retries
+                        wait_time = self.retry_delay_seconds * (2 ** retry)
+                        logger.info(f"Retrying in {wait_time} seconds...")
+                        await asyncio.sleep(wait_time)
+                    else:
+                        logger.error("Max retries reached, giving up on this batch")
+            return 0
     
     async def _save_to_database(self, records: List[TranscriptRecord]):
         """
@@ -138,7 +173,7 @@ class TranscriptDispatcher:
                             serial=record.serial,
                             transcript=record.transcript,
                             speaker=primary_speaker,
-                            created_at=record.created_at
+                            created_at=datetime.utcfromtimestamp(record.created_at)
                         )
                         db_transcripts.append(transcript)
                     except ValueError as e:
@@ -152,14 +187,15 @@ class TranscriptDispatcher:
                     logger.warning("No valid transcripts to save to database")
 
 
-# Singleton instance
-_dispatcher = TranscriptDispatcher()
-
+@lru_cache(maxsize=None)
 def get_dispatcher() -> TranscriptDispatcher:
     """
     Get the global instance of the transcript dispatcher.
+
+    lru_cache makes the singleton lazy and repeat calls a C-level
+    pointer return.
     """
-    return _dispatcher
+    return TranscriptDispatcher()
 
 async def start_dispatcher():
     """Start the global transcript dispatcher."""
@@ -1,12 +1,18 @@
 import asyncio
+import threading
 import time
+from functools import lru_cache
+from array import array
+from collections import deque
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass, field
-from datetime import datetime
 from loguru import logger
 import json
 
-@dataclass
+# Number of store shards; a power of two so the shard index is a bit mask
+_SHARD_COUNT = 16
+
+@dataclass(slots=True)
 class TranscriptSegment:
     """Data class to hold segment information from transcript."""
     id: int
@@ -15,68 +21,142 @@ class TranscriptSegment:
     text: str
     speaker: str = "SPEAKER_00"
 
-@dataclass
+
+class SegmentTable:
+    """
+    Column-oriented storage for a record's segments.
+
+    Numeric columns live in compact typed arrays and strings in plain lists,
+    so a record holds five columns instead of one heap object per segment.
+    Indexing and iteration materialize TranscriptSegment views on demand,
+    keeping existing consumers unchanged.
+    """
+    __slots__ = ("ids", "starts", "ends", "texts", "speakers")
+
+    def __init__(self):
+        self.ids = array("i")
+        self.starts = array("d")
+        self.ends = array("d")
+        self.texts: List[str] = []
+        self.speakers: List[str] = []
+
+    @classmethod
+    def from_dicts(cls, dicts) -> "SegmentTable":
+        """Build a table from segment dicts, one comprehension per column."""
+        table = cls()
+        if dicts:
+            table.ids = array("i", [d.get("id", 0) for d in dicts])
+            table.starts = array("d", [d.get("start", 0.0) for d in dicts])
+            table.ends = array("d", [d.get("end", 0.0) for d in dicts])
+            table.texts = [d.get("text", "") for d in dicts]
+            table.speakers = [d.get("speaker", "SPEAKER_00") for d in dicts]
+        return table
+
+    def append(self, id: int, start: float, end: float, text: str, speaker: str):
+        """Append one segment's values to the columns."""
+        self.ids.append(id)
+        self.starts.append(start)
+        self.ends.append(end)
+        self.texts.append(text)
+        self.speakers.append(speaker)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, index: int) -> TranscriptSegment:
+        return TranscriptSegment(
+            id=self.ids[index],
+            start=self.starts[index],
+            end=self.ends[index],
+            text=self.texts[index],
+            speaker=self.speakers[index],
+        )
+
+    def __iter__(self):
+        for index in range(len(self.ids)):
+            yield self[index]
+
+@dataclass(slots=True)
 class TranscriptRecord:
     """Data class to hold transcript information."""
     session_id: str
     serial: int
     transcript: str  # Full text
-    segments: List[TranscriptSegment] = field(default_factory=list)
+    segments: SegmentTable = field(default_factory=SegmentTable)
     speakers: List[str] = field(default_factory=lambda: ["SPEAKER_00"])
-    created_at: datetime = None
+    # Wall-clock seconds (time.time()); a plain float avoids allocating a
+    # datetime per record and keeps age comparisons to float arithmetic
+    created_at: float = field(default_factory=time.time)
     status: str = "pending"
-    
-    def __post_init__(self):
-        if self.created_at is None:
-            self.created_at = datetime.utcnow()
 
 
 class InMemoryTranscriptionStore:
     """
     A thread-safe in-memory store for transcriptions.
     Provides operations to add, query, and mark transcripts as dispatched.
+
+    Storage is sharded by session_id so unrelated sessions don't contend on
+    a single lock; operations on one session only touch its own shard.
     """
-    
+
     def __init__(self):
-        # Main storage: {session_id: {serial: TranscriptRecord}}
-        self._transcripts: Dict[str, Dict[int, TranscriptRecord]] = {}
-        self._lock = asyncio.Lock()
-        
+        # Per-shard storage: each shard maps {session_id: {serial: TranscriptRecord}}
+        self._shard_transcripts: List[Dict[str, Dict[int, TranscriptRecord]]] = [
+            {} for _ in range(_SHARD_COUNT)
+        ]
+        # Plain sync locks: every critical section is a pure in-memory dict op
+        # with no await inside, so there's no need to suspend the coroutine.
+        # threading.Lock also keeps these safe if called from a thread pool.
+        self._locks: List[threading.Lock] = [threading.Lock() for _ in range(_SHARD_COUNT)]
+        # Event set whenever a new transcript is added, so consumers
+        # (e.g. the dispatcher) can wake up early instead of polling
+        self._new_transcript_event = asyncio.Event()
+        # Per-shard sets of sessions the store has seen, and those the producer
+        # has finished. While a session is seen-but-incomplete the memory store
+        # is authoritative, so readers can skip the database fallback.
+        self._shard_seen: List[set] = [set() for _ in range(_SHARD_COUNT)]
+        self._shard_completed: List[set] = [set() for _ in range(_SHARD_COUNT)]
+        # Per-shard index of (session_id, serial) keys with 'pending' status,
+        # so pending lookups are O(pending) instead of scanning every record
+        self._shard_pending: List[set] = [set() for _ in range(_SHARD_COUNT)]
+        # Per-shard age index, ordered by insertion time. time.monotonic() is
+        # non-decreasing, so purging is a popleft loop over expired heads
+        # instead of a scan of every record
+        self._shard_age: List[deque] = [deque() for _ in range(_SHARD_COUNT)]
+        # Background purge task; started from the application startup hook
+        self._purge_task: Optional[asyncio.Task] = None
+
+    def _shard(self, session_id: str) -> int:
+        """Return the shard index for a session."""
+        return hash(session_id) & (_SHARD_COUNT - 1)
+
     async def add_transcript(
-        self, 
-        session_id: str, 
-        serial: int, 
+        self,
+        session_id: str,
+        serial: int,
         transcript_data: Dict[str, Any]
     ) -> TranscriptRecord:
         """
         Add a transcript to the in-memory store.
-        
+
         Args:
             session_id: Unique identifier for the transcription session
             serial: Sequential number for the transcript within the session
             transcript_data: Dictionary containing transcript text, segments and speakers
-            
+
         Returns:
             The created TranscriptRecord
         """
         # Extract text from transcript data
         text = transcript_data.get("text", "")
-        
-        # Extract and convert segments to TranscriptSegment objects
-        segments = []
-        for segment_data in transcript_data.get("segments", []):
-            segment = TranscriptSegment(
-                id=segment_data.get("id", 0),
-                start=segment_data.get("start", 0.0),
-                end=segment_data.get("end", 0.0),
-                text=segment_data.get("text", ""),
-                speaker=segment_data.get("speaker", "SPEAKER_00")
-            )
-            segments.append(segment)
-        
+
+        # Fill the segment columns in bulk; comprehensions inline the append
+        # that an explicit per-segment loop would pay for on every element
+        segments = SegmentTable.from_dicts(transcript_data.get("segments", ()))
+
         # Extract speakers
         speakers = transcript_data.get("speakers", ["SPEAKER_00"])
-        
+
         # Create the record
         record = TranscriptRecord(
             session_id=session_id,
@@ -85,139 +165,339 @@ class InMemoryTranscriptionStore:
             segments=segments,
             speakers=speakers
         )
-        
-        async with self._lock:
+
+        idx = self._shard(session_id)
+        with self._locks[idx]:
+            transcripts = self._shard_transcripts[idx]
             # Create session dict if it doesn't exist
-            if session_id not in self._transcripts:
-                self._transcripts[session_id] = {}
-            
+            if session_id not in transcripts:
+                transcripts[session_id] = {}
+
             # Add the transcript to the session
-            self._transcripts[session_id][serial] = record
-            
+            transcripts[session_id][serial] = record
+            self._shard_seen[idx].add(session_id)
+            self._shard_pending[idx].add((session_id, serial))
+            self._shard_age[idx].append((time.monotonic(), session_id, serial))
+
+        # Wake up any consumer waiting for new transcripts
+        self._new_transcript_event.set()
+
         logger.debug(f"Added transcript to in-memory store: session={session_id}, serial={serial}")
         return record
-    
+
+    async def add_transcripts(self, entries) -> List[TranscriptRecord]:
+        """
+        Add a batch of transcripts in one pass.
+
+        Records are built outside any lock and grouped by shard, so each
+        shard's lock is acquired once for its whole group instead of once
+        per record.
+
+        Args:
+            entries: Iterable of (session_id, serial, transcript_data)
+                tuples; transcript_data may be the usual dict or a plain
+                text string
+
+        Returns:
+            The created TranscriptRecords, in input order
+        """
+        records = []
+        by_shard: Dict[int, List[TranscriptRecord]] = {}
+        for session_id, serial, transcript_data in entries:
+            if isinstance(transcript_data, str):
+                transcript_data = {"text": transcript_data}
+            record = TranscriptRecord(
+                session_id=session_id,
+                serial=serial,
+                transcript=transcript_data.get("text", ""),
+                segments=SegmentTable.from_dicts(transcript_data.get("segments", ())),
+                speakers=transcript_data.get("speakers", ["SPEAKER_00"]),
+            )
+            records.append(record)
+            by_shard.setdefault(self._shard(session_id), []).append(record)
+
+        for idx, shard_records in by_shard.items():
+            with self._locks[idx]:
+                transcripts = self._shard_transcripts[idx]
+                for record in shard_records:
+                    transcripts.setdefault(record.session_id, {})[record.serial] = record
+                    self._shard_seen[idx].add(record.session_id)
+                    self._shard_pending[idx].add((record.session_id, record.serial))
+                    self._shard_age[idx].append(
+                        (time.monotonic(), record.session_id, record.serial)
+                    )
+
+        if records:
+            # Wake up any consumer waiting for new transcripts
+            self._new_transcript_event.set()
+            logger.debug(f"Added {len(records)} transcripts to in-memory store in one batch")
+        return records
+
+    def _pending_count(self) -> int:
+        """Count pending transcripts via the per-shard pending index."""
+        count = 0
+        for idx in range(_SHARD_COUNT):
+            with self._locks[idx]:
+                count += len(self._shard_pending[idx])
+        return count
+
+    async def wait_until(self, min_pending: int = 1, timeout: float = 5.0) -> bool:
+        """
+        Wait until at least `min_pending` transcripts are pending or the timeout elapses.
+
+        Allows consumers like the dispatcher to batch aggressively under load while
+        keeping latency low when transcripts trickle in slowly.
+
+        Args:
+            min_pending: Number of pending transcripts to wait for
+            timeout: Maximum time to wait in seconds
+
+        Returns:
+            True if the pending threshold was reached, False on timeout
+        """
+        loop = asyncio.get_event_loop()
+        deadline = loop.time() + timeout
+
+        while True:
+            if self._pending_count() >= min_pending:
+                return True
+
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return False
+
+            self._new_transcript_event.clear()
+            try:
+                await asyncio.wait_for(self._new_transcript_event.wait(), timeout=remaining)
+            except asyncio.TimeoutError:
+                return False
+
+    async def mark_session_complete(self, session_id: str):
+        """
+        Mark a session as fully ingested by the producer.
+
+        After this, an empty in-memory result means records may have been
+        dispatched and evicted, so readers should fall back to the database.
+
+        Args:
+            session_id: Session identifier
+        """
+        idx = self._shard(session_id)
+        with self._locks[idx]:
+            self._shard_completed[idx].add(session_id)
+
+    async def is_session_live(self, session_id: str) -> bool:
+        """
+        Check whether a session is still being produced into this store.
+
+        Args:
+            session_id: Session identifier
+
+        Returns:
+            True if the session has been seen and not yet marked complete
+        """
+        idx = self._shard(session_id)
+        with self._locks[idx]:
+            return (
+                session_id in self._shard_seen[idx]
+                and session_id not in self._shard_completed[idx]
+            )
+
     async def get_pending_transcripts(self, limit: int = 100) -> List[TranscriptRecord]:
         """
         Retrieve all transcripts with 'pending' status, up to the specified limit.
-        
+
         Args:
             limit: Maximum number of transcripts to return
-            
+
         Returns:
             List of pending TranscriptRecord objects
         """
         pending_records = []
-        
-        async with self._lock:
-            for session_dict in self._transcripts.values():
-                for record in session_dict.values():
-                    if record.status == "pending":
-                        pending_records.append(record)
-                        if len(pending_records) >= limit:
-                            break
-                if len(pending_records) >= limit:
-                    break
-                    
+
+        # Resolve records through the pending index, visiting shards one at a
+        # time and holding each lock only briefly
+        for idx in range(_SHARD_COUNT):
+            with self._locks[idx]:
+                transcripts = self._shard_transcripts[idx]
+                for session_id, serial in self._shard_pending[idx]:
+                    pending_records.append(transcripts[session_id][serial])
+                    if len(pending_records) >= limit:
+                        break
+            if len(pending_records) >= limit:
+                break
+
         return pending_records
-    
+
     async def mark_as_dispatched(self, session_id: str, serial: int) -> bool:
         """
         Mark a transcript as dispatched.
-        
+
         Args:
             session_id: Session identifier
             serial: Serial number of the transcript
-            
+
         Returns:
             True if the transcript was found and marked, False otherwise
         """
-        async with self._lock:
-            if session_id in self._transcripts and serial in self._transcripts[session_id]:
-                self._transcripts[session_id][serial].status = "dispatched"
-                logger.debug(f"Marked transcript as dispatched: session={session_id}, serial={serial}")
-                return True
-            return False
-    
+        idx = self._shard(session_id)
+        with self._locks[idx]:
+            # EAFP: one probe per dict on the hit path instead of
+            # membership checks followed by a second lookup
+            try:
+                record = self._shard_transcripts[idx][session_id][serial]
+            except KeyError:
+                return False
+            record.status = "dispatched"
+            self._shard_pending[idx].discard((session_id, serial))
+
+        logger.debug(f"Marked transcript as dispatched: session={session_id}, serial={serial}")
+        return True
+
     async def remove_transcript(self, session_id: str, serial: int) -> bool:
         """
         Remove a transcript from the store.
-        
+
         Args:
             session_id: Session identifier
             serial: Serial number of the transcript
-            
+
         Returns:
             True if the transcript was found and removed, False otherwise
         """
-        async with self._lock:
-            if session_id in self._transcripts and serial in self._transcripts[session_id]:
-                del self._transcripts[session_id][serial]
-                # Clean up empty session
-                if not self._transcripts[session_id]:
-                    del self._transcripts[session_id]
-                logger.debug(f"Removed transcript from store: session={session_id}, serial={serial}")
-                return True
-            return False
-    
+        idx = self._shard(session_id)
+        with self._locks[idx]:
+            transcripts = self._shard_transcripts[idx]
+            try:
+                session_dict = transcripts[session_id]
+                del session_dict[serial]
+            except KeyError:
+                return False
+            self._shard_pending[idx].discard((session_id, serial))
+            # Clean up empty session, including the seen/completed marks —
+            # otherwise those sets grow by one entry per session forever
+            if not session_dict:
+                del transcripts[session_id]
+                self._shard_seen[idx].discard(session_id)
+                self._shard_completed[idx].discard(session_id)
+
+        logger.debug(f"Removed transcript from store: session={session_id}, serial={serial}")
+        return True
+
     async def get_transcripts_for_session(self, session_id: str) -> List[TranscriptRecord]:
         """
         Get all transcripts for a specific session.
-        
+
         Args:
             session_id: Session identifier
-            
+
         Returns:
             List of TranscriptRecord objects for the session
         """
-        async with self._lock:
-            if session_id not in self._transcripts:
+        idx = self._shard(session_id)
+        with self._locks[idx]:
+            transcripts = self._shard_transcripts[idx]
+            if session_id not in transcripts:
                 return []
-            
+
             # Return a sorted list of transcripts by serial number
             return sorted(
-                list(self._transcripts[session_id].values()),
+                list(transcripts[session_id].values()),
                 key=lambda record: record.serial
             )
-    
+
     async def purge_old_transcripts(self, max_age_seconds: int = 3600) -> int:
         """
         Remove transcripts older than the specified age.
-        
+
         Args:
             max_age_seconds: Maximum age in seconds for transcripts to keep
-            
+
         Returns:
             Number of transcripts removed
         """
-        now = datetime.utcnow()
+        cutoff = time.monotonic() - max_age_seconds
         removed_count = 0
-        
-        async with self._lock:
-            for session_id in list(self._transcripts.keys()):
-                for serial in list(self._transcripts[session_id].keys()):
-                    record = self._transcripts[session_id][serial]
-                    age = (now - record.created_at).total_seconds()
-                    
-                    if age > max_age_seconds:
-                        del self._transcripts[session_id][serial]
-                        removed_count += 1
-                
-                # Clean up empty session
-                if not self._transcripts[session_id]:
-                    del self._transcripts[session_id]
-                    
+
+        # Visit shards one at a time, holding each lock only briefly. The age
+        # index is insertion-ordered, so only expired heads are examined
+        for idx in range(_SHARD_COUNT):
+            with self._locks[idx]:
+                transcripts = self._shard_transcripts[idx]
+                age_index = self._shard_age[idx]
+                while age_index and age_index[0][0] < cutoff:
+                    _, session_id, serial = age_index.popleft()
+
+                    # The record may already have been removed by the dispatcher
+                    session_dict = transcripts.get(session_id)
+                    if session_dict is None or serial not in session_dict:
+                        continue
+
+                    del session_dict[serial]
+                    self._shard_pending[idx].discard((session_id, serial))
+                    removed_count += 1
+
+                    # Clean up empty session, including the seen/completed
+                    # marks, so long-gone sessions don't accumulate there
+                    if not session_dict:
+                        del transcripts[session_id]
+                        self._shard_seen[idx].discard(session_id)
+                        self._shard_completed[idx].discard(session_id)
+
         if removed_count > 0:
             logger.info(f"Purged {removed_count} old transcripts from in-memory store")
-            
+
         return removed_count
 
+    async def start_purge_loop(self, interval_seconds: float = 60.0, max_age_seconds: int = 3600):
+        """
+        Start the background purge task.
 
-# Singleton instance for global access
-_transcript_store = InMemoryTranscriptionStore()
+        Purging runs on its own cadence so expired records never have to be
+        cleaned up opportunistically from request paths.
 
+        Args:
+            interval_seconds: How often to run a purge pass
+            max_age_seconds: Maximum age in seconds for transcripts to keep
+        """
+        if self._purge_task is not None:
+            logger.warning("Purge loop is already running")
+            return
+
+        self._purge_task = asyncio.create_task(
+            self._purge_loop(interval_seconds, max_age_seconds)
+        )
+        logger.info(f"Transcript purge loop started (interval={interval_seconds}s, max_age={max_age_seconds}s)")
+
+    async def stop_purge_loop(self):
+        """Stop the background purge task."""
+        if self._purge_task is None:
+            return
+
+        self._purge_task.cancel()
+        try:
+            await self._purge_task
+        except asyncio.CancelledError:
+            pass
+        self._purge_task = None
+        logger.info("Transcript purge loop stopped")
+
+    async def _purge_loop(self, interval_seconds: float, max_age_seconds: int):
+        """Periodically purge expired transcripts until cancelled."""
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                await self.purge_old_transcripts(max_age_seconds)
+            except Exception as e:
+                logger.error(f"Error purging old transcripts: {e}")
+
+
+@lru_cache(maxsize=None)
 def get_transcript_store() -> InMemoryTranscriptionStore:
     """
     Get the global instance of the in-memory transcript store.
+
+    lru_cache makes the singleton lazy and repeat calls a C-level
+    pointer return.
     """
-    return _transcript_store 
\ No newline at end of file
+    return InMemoryTranscriptionStore()
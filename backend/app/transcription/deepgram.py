@@ -1,16 +1,35 @@
 import asyncio
 import base64
-import json
 import httpx
-from typing import Dict, Any, List
+import orjson
+from typing import Dict, Any, List, Optional
 from .base import BaseTranscriptionService
 from loguru import logger
 import os
-from dotenv import load_dotenv, find_dotenv
 
-find_dotenv()
-load_dotenv()
 
+# Shared client so every transcribe call reuses pooled TLS/HTTP2 connections
+# instead of paying a fresh handshake per request
+_shared_client: Optional[httpx.AsyncClient] = None
+
+def _get_client() -> httpx.AsyncClient:
+    """Lazily create the shared HTTP client for Deepgram batch requests."""
+    global _shared_client
+    if _shared_client is None:
+        _shared_client = httpx.AsyncClient(
+            http2=True,
+            timeout=10.0,
+            limits=httpx.Limits(max_keepalive_connections=32),
+        )
+    return _shared_client
+
+
+async def aclose_client():
+    """Close the shared HTTP client; called on application shutdown."""
+    global _shared_client
+    if _shared_client is not None:
+        await _shared_client.aclose()
+        _shared_client = None
 
 
 class DeepgramTranscriptionService(BaseTranscriptionService):
@@ -20,7 +39,7 @@ class DeepgramTranscriptionService(BaseTranscriptionService):
     def __init__(self, api_key: str = None):
         """
         Initialize the Deepgram transcription service.
-        
+
         Args:
             api_key: The Deepgram API key
         """
@@ -32,10 +51,10 @@ class DeepgramTranscriptionService(BaseTranscriptionService):
     async def transcribe(self, audio_data: str) -> Dict[str, Any]:
         """
         Transcribe audio data using the Deepgram API.
-        
+
         Args:
             audio_data: Base64 encoded audio data
-            
+
         Returns:
             Dictionary containing transcription data including text, segments, and speakers
         """
@@ -58,86 +77,88 @@ class DeepgramTranscriptionService(BaseTranscriptionService):
                 "utterances": "true"  # Get utterances by speaker
             }
 
-            # Make async request to Deepgram
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    self.base_url,
-                    headers=headers,
-                    params=params,
-                    content=decoded_audio,
-                    timeout=10.0
-                )
-
-                if response.status_code == 200:
-                    # Parse and extract detailed transcript data from response
-                    result = response.json()
-                    
-                    # Extract full transcript text from results
-                    channel_results = result.get("results", {}).get("channels", [{}])
-                    if not channel_results:
-                        return self._create_error_response("No channel results found")
-                    
-                    channel = channel_results[0]
-                    alternatives = channel.get("alternatives", [{}])
-                    if not alternatives:
-                        return self._create_error_response("No alternatives found")
-                    
-                    # Get the transcript text
-                    text = alternatives[0].get("transcript", "")
-                    
-                    # Process segments (words with timing info)
-                    words = alternatives[0].get("words", [])
-                    
-                    # Process utterances (speaker segments)
-                    utterances = channel.get("utterances", [])
-                    
-                    # Extract unique speakers
-                    speakers = list(set(u.get("speaker", f"SPEAKER_{i}") 
-                                       for i, u in enumerate(utterances)))
-                    
-                    # If no speakers detected, use default
-                    if not speakers:
-                        speakers = ["SPEAKER_00"]
-                    
-                    # Create segments from utterances
-                    segments = []
-                    for i, utterance in enumerate(utterances):
-                        speaker = utterance.get("speaker", f"SPEAKER_{i % len(speakers) if speakers else 0}")
-                        segment = {
-                            "id": i,
-                            "start": utterance.get("start", 0),
-                            "end": utterance.get("end", 0),
-                            "text": utterance.get("transcript", ""),
-                            "speaker": speaker
-                        }
-                        segments.append(segment)
-                    
-                    # If no segments/utterances available, create a single segment
-                    if not segments and text:
-                        segments = [{
-                            "id": 0,
-                            "start": 0,
-                            "end": 0 if not words else words[-1].get("end", 0),
-                            "text": text,
-                            "speaker": "SPEAKER_00"
-                        }]
-                    
-                    # Create structured response
-                    response_data = {
-                        "text": text,
-                        "segments": segments,
-                        "speakers": speakers
+            # Make the request on the shared client so TLS/HTTP2
+            # connections are reused across calls
+            client = _get_client()
+            response = await client.post(
+                self.base_url,
+                headers=headers,
+                params=params,
+                content=decoded_audio,
+            )
+
+            if response.status_code == 200:
+                # Parse and extract detailed transcript data from response
+                result = orjson.loads(response.content)
+
+                # Extract the transcript via direct indexing: successful
+                # responses always carry this shape, so EAFP skips the
+                # default-object allocation of chained .get() lookups
+                try:
+                    channel = result["results"]["channels"][0]
+                    alternative = channel["alternatives"][0]
+                except (KeyError, IndexError):
+                    return self._create_error_response("No channel results found")
+
+                # Get the transcript text
+                text = alternative.get("transcript", "")
+
+                # Process segments (words with timing info)
+                words = alternative.get("words", [])
+
+                # Process utterances (speaker segments)
+                utterances = channel.get("utterances", [])
+
+                # Extract unique speakers with a running set in one pass
+                speakers_set = set()
+                for i, u in enumerate(utterances):
+                    speakers_set.add(u.get("speaker", f"SPEAKER_{i}"))
+                speakers = list(speakers_set)
+
+                # If no speakers detected, use default
+                if not speakers:
+                    speakers = ["SPEAKER_00"]
+
+                # Create segments from utterances; the count is known
+                # upfront, so allocate the list once and assign by index
+                # instead of growing it append by append
+                segments = [None] * len(utterances)
+                for i, utterance in enumerate(utterances):
+                    speaker = utterance.get("speaker", f"SPEAKER_{i % len(speakers) if speakers else 0}")
+                    segments[i] = {
+                        "id": i,
+                        "start": utterance.get("start", 0),
+                        "end": utterance.get("end", 0),
+                        "text": utterance.get("transcript", ""),
+                        "speaker": speaker
                     }
-                    
-                    return response_data
-                else:
-                    logger.error(f"Deepgram API error: {response.status_code} - {response.text}")
-                    return self._create_error_response(f"Transcription error: {response.status_code}")
+
+                # If no segments/utterances available, create a single segment
+                if not segments and text:
+                    segments = [{
+                        "id": 0,
+                        "start": 0,
+                        "end": 0 if not words else words[-1].get("end", 0),
+                        "text": text,
+                        "speaker": "SPEAKER_00"
+                    }]
+
+                # Create structured response
+                response_data = {
+                    "text": text,
+                    "segments": segments,
+                    "speakers": speakers
+                }
+
+                return response_data
+            else:
+                logger.error(f"Deepgram API error: {response.status_code} - {response.text}")
+                return self._create_error_response(f"Transcription error: {response.status_code}")
 
         except Exception as e:
             logger.exception(f"Error in DeepgramTranscriptionService: {str(e)}")
             return self._create_error_response(f"Transcription failed: {str(e)}")
-    
+
     def _create_error_response(self, error_message: str) -> Dict[str, Any]:
         """Helper method to create error response structure"""
         return {
@@ -1,34 +1,65 @@
 import asyncio
-import json
 import time
+from itertools import groupby
+from operator import methodcaller
 import uuid
 import ssl
 from typing import Dict, Any, Optional, Callable, List
 from datetime import datetime
 from loguru import logger
+import orjson
 import websockets
-from dotenv import load_dotenv, find_dotenv
 
 from app.store.storage import TranscriptSegment, get_transcript_store
 
-find_dotenv()
-load_dotenv()
+
+# Streaming endpoint with its (static) transcription parameters, built once at
+# import time instead of re-deriving the query string on every connect.
+# Documentation: https://developers.deepgram.com/docs/transcription-parameters
+_DEEPGRAM_URI = (
+    "wss://api.deepgram.com/v1/listen"
+    "?encoding=linear16"    # Raw PCM audio
+    "&sample_rate=16000"    # 16 kHz
+    "&channels=1"           # Mono audio
+    "&language=en"          # English
+    "&model=nova-2"         # Enhanced model
+    "&tier=enhanced"        # Enhanced tier
+    "&punctuate=true"       # Add punctuation
+    "&diarize=true"         # Speaker diarization
+    "&smart_format=true"    # Format numbers, dates, etc.
+    "&utterances=true"      # Segment into utterances
+    "&interim_results=true" # Get interim results
+)
+
+
+def _word_speaker(word: Dict[str, Any]) -> str:
+    """Grouping key for speaker segmentation."""
+    return word.get("speaker", "SPEAKER_00")
+
+
+# C-level accessors for the hot words loop; a methodcaller call skips the
+# bound-method creation a plain word.get(...) pays per invocation
+_word_start = methodcaller("get", "start", 0.0)
+_word_end = methodcaller("get", "end", 0.0)
+_word_punctuated = methodcaller("get", "punctuated_word")
+
+
 class DeepgramStreamingService:
     """
     Service that provides real-time streaming transcription using Deepgram's WebSocket API.
     Manages a connection for a single client session.
     """
-    
+
     def __init__(
-        self, 
-        api_key: str, 
-        session_id: str, 
+        self,
+        api_key: str,
+        session_id: str,
         client_websocket,  # FastAPI WebSocket object
         result_callback: Callable
     ):
         """
         Initialize the Deepgram streaming service.
-        
+
         Args:
             api_key: Deepgram API key
             session_id: Unique session identifier
@@ -39,51 +70,45 @@ class DeepgramStreamingService:
         self.session_id = session_id
         self.client_websocket = client_websocket
         self.result_callback = result_callback
-        
+
         # WebSocket connection to Deepgram
         self._deepgram_ws = None
-        
+
         # Background tasks
         self._receive_task = None
         self._keep_alive_task = None
-        
+
         # State variables
         self._current_serial = 0
         self._is_connected = False
-        
+
+        # Freelist of segment dicts reused across messages; high-volume
+        # sessions would otherwise allocate fresh dicts on every frame
+        self._seg_pool: List[Dict[str, Any]] = []
+
         logger.info(f"Session {session_id}: Created Deepgram streaming service")
-    
+
+    def _acquire_seg(self) -> Dict[str, Any]:
+        """Take a segment dict from the pool, or allocate a new one."""
+        return self._seg_pool.pop() if self._seg_pool else {}
+
+    def _release_segs(self, segments: List[Dict[str, Any]]):
+        """Return segment dicts to the pool once consumers are done with them."""
+        self._seg_pool.extend(segments)
+
     async def connect(self):
         """
         Establish connection to Deepgram's WebSocket API.
-        
+
         Raises:
             Exception: If connection fails
         """
         if self._is_connected:
             logger.warning(f"Session {self.session_id}: Already connected to Deepgram")
             return
-        
-        # Construct the WebSocket URL with query parameters
-        # Documentation: https://developers.deepgram.com/docs/transcription-parameters
-        params = {
-            "encoding": "linear16",  # Raw PCM audio
-            "sample_rate": 16000,    # 16 kHz
-            "channels": 1,           # Mono audio
-            "language": "en",        # English
-            "model": "nova-2",       # Enhanced model
-            "tier": "enhanced",      # Enhanced tier
-            "punctuate": True,       # Add punctuation
-            "diarize": True,         # Speaker diarization
-            "smart_format": True,    # Format numbers, dates, etc.
-            "utterances": True,      # Segment into utterances
-            "interim_results": True, # Get interim results
-        }
-        
-        query_string = "&".join([f"{k}={v}" for k, v in params.items() if not isinstance(v, bool)] + 
-                               [f"{k}=true" for k, v in params.items() if v is True])
-        uri = f"wss://api.deepgram.com/v1/listen?{query_string}"
-        
+
+        uri = _DEEPGRAM_URI
+
         try:
             # For websockets 15.0.1, we need to use a slightly different approach
             # Create a connection using the proper header format
@@ -94,35 +119,35 @@ class DeepgramStreamingService:
                 additional_headers={"Authorization": f"token {self.api_key}"},
                 ssl=ssl_context
             )
-            
+
             # Start the receive loop and keep-alive loop as background tasks
             self._receive_task = asyncio.create_task(self._receive_loop())
             self._keep_alive_task = asyncio.create_task(self._keep_alive_loop())
-            
+
             self._is_connected = True
             logger.info(f"Session {self.session_id}: Connected to Deepgram streaming API")
-        
+
         except Exception as e:
             logger.error(f"Session {self.session_id}: Failed to connect to Deepgram: {str(e)}")
             # Ensure tasks are cleaned up if connection fails
             await self.close()
             # Re-raise the exception
             raise
-    
+
     async def send_audio(self, audio_chunk: bytes):
         """
         Send audio data to Deepgram.
-        
+
         Args:
             audio_chunk: Raw audio bytes
-            
+
         Raises:
             Exception: If the connection is closed or another error occurs
         """
         if not self._is_connected or not self._deepgram_ws:
             logger.error(f"Session {self.session_id}: Cannot send audio - not connected to Deepgram")
             return
-        
+
         try:
             await self._deepgram_ws.send(audio_chunk)
         except Exception as e:
@@ -131,7 +156,7 @@ class DeepgramStreamingService:
             if "closed" in str(e).lower():
                 await self.close()
                 raise
-    
+
     async def _receive_loop(self):
         """
         Background task that receives and processes messages from Deepgram.
@@ -139,28 +164,28 @@ class DeepgramStreamingService:
         if not self._deepgram_ws:
             logger.error(f"Session {self.session_id}: WebSocket not initialized in receive loop")
             return
-        
+
         try:
             async for message in self._deepgram_ws:
                 # Parse the JSON message
                 try:
-                    response = json.loads(message)
+                    response = orjson.loads(message)
                     await self._process_response(response)
-                except json.JSONDecodeError as e:
+                except orjson.JSONDecodeError as e:
                     logger.error(f"Session {self.session_id}: Failed to parse Deepgram message: {str(e)}")
                 except Exception as e:
                     logger.error(f"Session {self.session_id}: Error processing Deepgram message: {str(e)}")
-        
+
         except websockets.exceptions.ConnectionClosed as e:
             logger.warning(f"Session {self.session_id}: Deepgram connection closed: {str(e)}")
-        
+
         except Exception as e:
             logger.error(f"Session {self.session_id}: Error in receive loop: {str(e)}")
-        
+
         finally:
             # Ensure we clean up if the loop exits
             await self.close()
-    
+
     async def _keep_alive_loop(self):
         """
         Background task that sends periodic keep-alive messages to Deepgram.
@@ -168,27 +193,29 @@ class DeepgramStreamingService:
         try:
             while self._is_connected and self._deepgram_ws:
                 await asyncio.sleep(30)  # Send keep-alive every 30 seconds
-                
+
                 if self._is_connected and self._deepgram_ws:
                     try:
-                        # Send an empty object as keep-alive
-                        await self._deepgram_ws.send(json.dumps({"type": "KeepAlive"}))
+                        # Send an empty object as keep-alive, decoded to str
+                        # so it goes out as a text frame; Deepgram treats
+                        # binary frames as audio
+                        await self._deepgram_ws.send(orjson.dumps({"type": "KeepAlive"}).decode())
                         logger.debug(f"Session {self.session_id}: Sent keep-alive to Deepgram")
                     except Exception as e:
                         logger.error(f"Session {self.session_id}: Failed to send keep-alive: {str(e)}")
                         break
-        
+
         except asyncio.CancelledError:
             # Task was cancelled, exit gracefully
             pass
-        
+
         except Exception as e:
             logger.error(f"Session {self.session_id}: Error in keep-alive loop: {str(e)}")
-    
+
     async def _process_response(self, response: Dict[str, Any]):
         """
         Process a response from Deepgram.
-        
+
         Args:
             response: JSON response from Deepgram
         """
@@ -203,97 +230,81 @@ class DeepgramStreamingService:
             if response["type"] == "Error":
                 logger.error(f"Session {self.session_id}: Deepgram error: {response.get('error', 'Unknown error')}")
                 return
-        
-        # Handle transcription results
-        if "channel" in response and "alternatives" in response["channel"]:
-            # Check if this is a final result
-            is_final = not response.get("is_interim", True)
-            
-            # Get the transcript text from the first alternative
-            alternatives = response["channel"]["alternatives"]
-            if alternatives and len(alternatives) > 0:
-                transcript_text = alternatives[0].get("transcript", "")
-                
-                # Process words and create segments with speaker information
-                if "words" in alternatives[0]:
-                    words = alternatives[0]["words"]
-                    segments = []
-                    
-                    # Group words by speaker
-                    current_speaker = None
-                    current_segment = {"text": "", "words": []}
-                    
-                    for word in words:
-                        speaker = word.get("speaker", "SPEAKER_00")
-                        
-                        # Start a new segment if speaker changes
-                        if current_speaker is not None and current_speaker != speaker:
-                            if current_segment["words"]:
-                                segment_start = current_segment["words"][0].get("start", 0.0)
-                                segment_end = current_segment["words"][-1].get("end", 0.0)
-                                
-                                segments.append({
-                                    "id": len(segments),
-                                    "start": segment_start,
-                                    "end": segment_end,
-                                    "text": current_segment["text"].strip(),
-                                    "speaker": current_speaker
-                                })
-                            
-                            # Reset for next segment
-                            current_segment = {"text": "", "words": []}
-                        
-                        current_speaker = speaker
-                        current_segment["text"] += word.get("punctuated_word", word.get("word", "")) + " "
-                        current_segment["words"].append(word)
-                    
-                    # Add the last segment if there's any
-                    if current_segment["words"]:
-                        segment_start = current_segment["words"][0].get("start", 0.0)
-                        segment_end = current_segment["words"][-1].get("end", 0.0)
-                        
-                        segments.append({
-                            "id": len(segments),
-                            "start": segment_start,
-                            "end": segment_end,
-                            "text": current_segment["text"].strip(),
-                            "speaker": current_speaker
-                        })
-                    
-                    # Extract unique speakers
-                    speakers = list(set(segment["speaker"] for segment in segments))
-                    
-                    # Create the transcript data structure
-                    transcript_data = {
-                        "text": transcript_text,
-                        "segments": segments,
-                        "speakers": speakers,
-                        "is_final": is_final
-                    }
-                    
-                    # Increment serial number for final results
-                    if is_final:
-                        self._current_serial += 1
-                    
-                    # Call the callback function with the results
-                    await self.result_callback(
-                        session_id=self.session_id,
-                        transcript_data=transcript_data,
-                        is_final=is_final,
-                        serial=self._current_serial if is_final else None
-                    )
-    
+
+        # Handle transcription results with a fixed walker: index straight to
+        # the one alternative we consume and never touch the metadata,
+        # confidence or other branches of the payload
+        try:
+            alternative = response["channel"]["alternatives"][0]
+        except (KeyError, IndexError):
+            return
+
+        # Check if this is a final result
+        is_final = not response.get("is_interim", True)
+
+        # Get the transcript text from the first alternative
+        transcript_text = alternative.get("transcript", "")
+
+        # Process words and create segments with speaker information
+        words = alternative.get("words")
+        if words is not None:
+            segments = []
+
+            # Group consecutive words by speaker in a single pass;
+            # groupby handles the run detection in C, and segment text
+            # is joined once per segment
+            speakers_set = set()
+            for speaker, group_iter in groupby(words, key=_word_speaker):
+                group = list(group_iter)
+                speakers_set.add(speaker)
+                segment = self._acquire_seg()
+                segment["id"] = len(segments)
+                segment["start"] = _word_start(group[0])
+                segment["end"] = _word_end(group[-1])
+                segment["text"] = " ".join(
+                    _word_punctuated(w) or w.get("word", "") for w in group
+                )
+                segment["speaker"] = speaker
+                segments.append(segment)
+
+            # Unique speakers, collected during the segmentation pass
+            speakers = list(speakers_set)
+
+            # Create the transcript data structure
+            transcript_data = {
+                "text": transcript_text,
+                "segments": segments,
+                "speakers": speakers,
+                "is_final": is_final
+            }
+
+            # Increment serial number for final results
+            if is_final:
+                self._current_serial += 1
+
+            # Call the callback function with the results
+            await self.result_callback(
+                session_id=self.session_id,
+                transcript_data=transcript_data,
+                is_final=is_final,
+                serial=self._current_serial if is_final else None
+            )
+
+            # The callback has copied what it needs (store columns,
+            # client JSON), so the dicts can be reused for the next frame
+            self._release_segs(segments)
+
     async def close(self):
         """Close the connection to Deepgram and clean up resources."""
         # Cancel background tasks
         if self._receive_task:
             self._receive_task.cancel()
             self._receive_task = None
-        
+
         if self._keep_alive_task:
             self._keep_alive_task.cancel()
             self._keep_alive_task = None
-        
+
         # Close the WebSocket connection
         if self._deepgram_ws:
             try:
@@ -301,6 +312,6 @@ class DeepgramStreamingService:
                 self._deepgram_ws = None
             except Exception as e:
                 logger.error(f"Session {self.session_id}: Error closing Deepgram WebSocket: {str(e)}")
-        
+
         self._is_connected = False
         logger.info(f"Session {self.session_id}: Closed Deepgram streaming connection") 
\ No newline at end of file
@@ -8,11 +8,16 @@ settings = get_settings()
 # Remove default logger
 logger.remove()
 
-# Add console logger
+# Add console logger. enqueue=True moves formatting off the calling
+# coroutine's thread, and diagnose/backtrace are disabled so records don't
+# re-walk stack frames
 logger.add(
     sys.stderr,
     level=settings.LOG_LEVEL,
-    format="<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>"
+    format="<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
+    enqueue=True,
+    diagnose=False,
+    backtrace=False,
 )
 
 # Add file logger with rotation
@@ -20,5 +25,8 @@ logger.add(
     settings.LOG_FILE,
     rotation=settings.LOG_ROTATION,
     level=settings.LOG_LEVEL,
-    format="{time:YYYY-MM-DD HH:mm:ss.SSS} | {level: <8} | {name}:{function}:{line} - {message}"
+    format="{time:YYYY-MM-DD HH:mm:ss.SSS} | {level: <8} | {name}:{function}:{line} - {message}",
+    enqueue=True,
+    diagnose=False,
+    backtrace=False,
 )
\ No newline at end of file
@@ -1,5 +1,9 @@
 """
 Script to upgrade database schema for transcript table
+
+PostgreSQL only; the id->UUID rebuild additionally requires
+PostgreSQL 14+, since its batched copy keys on ctid (tid comparison
+operators and max(tid) don't exist on earlier releases).
 """
 import asyncio
 import argparse
@@ -19,32 +23,26 @@ async def migrate_transcript_table():
     
     # Check if we need to run the migration
     async with engine.begin() as conn:
-        # Check for columns in transcript table
-        has_speaker_column = False
-        is_id_uuid = False
-        
         try:
-            # First check if transcripts table exists
-            result = await conn.execute(sa.text(
-                "SELECT EXISTS (SELECT FROM information_schema.tables WHERE table_name = 'transcripts')"
-            ))
-            table_exists = result.scalar()
+            # Fetch all the schema facts in a single round-trip instead of
+            # one information_schema query per check
+            result = await conn.execute(sa.text("""
+                SELECT
+                    EXISTS (SELECT FROM information_schema.tables
+                            WHERE table_name = 'transcripts') AS table_exists,
+                    EXISTS (SELECT FROM information_schema.columns
+                            WHERE table_name = 'transcripts'
+                              AND column_name = 'speaker') AS has_speaker_column,
+                    (SELECT data_type FROM information_schema.columns
+                     WHERE table_name = 'transcripts'
+                       AND column_name = 'id') AS id_type
+            """))
+            table_exists, has_speaker_column, id_type = result.one()
             
             if not table_exists:
                 logger.info("Transcripts table does not exist yet. No migration needed.")
                 return
             
-            # Check for speaker column
-            result = await conn.execute(sa.text(
-                "SELECT EXISTS (SELECT FROM information_schema.columns WHERE table_name = 'transcripts' AND column_name = 'speaker')"
-            ))
-            has_speaker_column = result.scalar()
-            
-            # Check id column type
-            result = await conn.execute(sa.text(
-                "SELECT data_type FROM information_schema.columns WHERE table_name = 'transcripts' AND column_name = 'id'"
-            ))
-            id_type = result.scalar()
             is_id_uuid = id_type and "uuid" in id_type.lower()
             
         except Exception as e:
@@ -62,9 +60,21 @@ async def migrate_transcript_table():
     if not is_id_uuid:
         logger.info("Converting id column to UUID (this will create a new table and transfer data)")
         
-        # This is complex - need to create a new table and migrate data
+        # The batched copy below keys on ctid, which needs PostgreSQL 14+
+        async with engine.begin() as conn:
+            result = await conn.execute(sa.text("SHOW server_version_num"))
+            server_version_num = int(result.scalar_one())
+        if server_version_num < 140000:
+            logger.error(
+                f"The id->UUID rebuild requires PostgreSQL 14+ for ctid-keyed "
+                f"batching (server_version_num={server_version_num}); aborting"
+            )
+            return
+        
+        # This is complex - need to create a new table and migrate data.
+        # One statement per execute: asyncpg can't run multiple commands
+        # in a single prepared statement
         async with engine.begin() as conn:
-            # Create a temporary new table with UUID id
             await conn.execute(sa.text("""
                 CREATE TABLE transcripts_new (
                     id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
@@ -75,25 +85,50 @@ async def migrate_transcript_table():
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 )
             """))
-            
-            # Create index on session_id
             await conn.execute(sa.text(
                 "CREATE INDEX idx_transcripts_new_session_id ON transcripts_new (session_id)"
             ))
+        
+        # Copy rows in bounded ctid-ordered batches, each committed on its
+        # own, so a large table doesn't pin one huge transaction, balloon
+        # the WAL or hold locks for the whole rebuild
+        batch_size = 50000
+        last_ctid = "(0,0)"
+        copied = 0
+        while True:
+            async with engine.begin() as conn:
+                result = await conn.execute(
+                    sa.text("""
+                        WITH batch AS (
+                            SELECT ctid, session_id, serial, transcript, speaker, created_at
+                            FROM transcripts
+                            WHERE ctid > CAST(:last_ctid AS tid)
+                            ORDER BY ctid
+                            LIMIT :batch_size
+                        ),
+                        ins AS (
+                            INSERT INTO transcripts_new (session_id, serial, transcript, speaker, created_at)
+                            SELECT session_id, serial, transcript,
+                                   COALESCE(speaker, 'SPEAKER_00') as speaker,
+                                   created_at
+                            FROM batch
+                        )
+                        SELECT max(ctid) AS last_ctid, count(*) AS n FROM batch
+                    """),
+                    {"last_ctid": last_ctid, "batch_size": batch_size},
+                )
+                max_ctid, n = result.one()
             
-            # Copy data from old table to new table
-            await conn.execute(sa.text("""
-                INSERT INTO transcripts_new (session_id, serial, transcript, speaker, created_at)
-                SELECT session_id, serial, transcript, 
-                       COALESCE(speaker, 'SPEAKER_00') as speaker, 
-                       created_at 
-                FROM transcripts
-            """))
-            
-            # Drop old table
+            if not n:
+                break
+            copied += n
+            last_ctid = str(max_ctid)
+            logger.info(f"Copied {copied} rows to transcripts_new")
+        
+        # Swap the tables once all rows are over (still one transaction,
+        # but one statement per execute for asyncpg's sake)
+        async with engine.begin() as conn:
             await conn.execute(sa.text("DROP TABLE transcripts"))
-            
-            # Rename new table to transcripts
             await conn.execute(sa.text("ALTER TABLE transcripts_new RENAME TO transcripts"))
     
     logger.info("Migration completed successfully")
@@ -107,4 +142,11 @@ async def main():
         logger.error(f"Migration failed: {str(e)}")
 
 if __name__ == "__main__":
+    # Use uvloop's C event loop when available
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+
     asyncio.run(main()) 
\ No newline at end of file
@@ -1,17 +1,18 @@
 import asyncio
 import json
+import urllib.parse
 import websockets
 import os
 import ssl
 from dotenv import load_dotenv
 
-# Load environment variables 
-load_dotenv()
 
-DEEPGRAM_API_KEY = os.environ.get("DEEPGRAM_API_KEY")
+# 6400 bytes of zeros (200ms of silence at 16kHz, 16-bit), shared across runs
+_SILENCE_200MS = bytes(6400)
 
 async def test_deepgram_connection():
     """Test direct connection to Deepgram WebSocket API"""
+    DEEPGRAM_API_KEY = os.environ.get("DEEPGRAM_API_KEY")
     if not DEEPGRAM_API_KEY:
         print("No Deepgram API key found in environment variables.")
         return
@@ -31,8 +32,9 @@ async def test_deepgram_connection():
         "interim_results": True,
     }
     
-    query_string = "&".join([f"{k}={v}" for k, v in params.items() if not isinstance(v, bool)] + 
-                           [f"{k}=true" for k, v in params.items() if v is True])
+    query_string = urllib.parse.urlencode(
+        {k: ("true" if v is True else v) for k, v in params.items()}
+    )
     uri = f"wss://api.deepgram.com/v1/listen?{query_string}"
     
     print(f"Connecting to: {uri}")
@@ -52,8 +54,7 @@ async def test_deepgram_connection():
         
         # Send a small audio chunk (silent)
         print("Sending a silent audio chunk...")
-        silent_chunk = bytes(6400)  # 6400 bytes of zeros (200ms of silence at 16kHz, 16-bit)
-        await connection.send(silent_chunk)
+        await connection.send(_SILENCE_200MS)
         
         # Wait for a response
         print("Waiting for a response...")
@@ -68,4 +69,13 @@ async def test_deepgram_connection():
         print(f"Error connecting to Deepgram: {e}")
 
 if __name__ == "__main__":
+    # Use uvloop's C event loop when available
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+
+    # Load environment variables only when run as a script
+    load_dotenv()
     asyncio.run(test_deepgram_connection()) 
\ No newline at end of file
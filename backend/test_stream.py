@@ -1,5 +1,5 @@
 import asyncio
-import json
+import orjson
 import websockets
 import os
 import base64
@@ -7,9 +7,6 @@ import sys
 import time
 from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
-
 async def test_streaming_transcription(session_id, audio_file_path):
     """
     Test the streaming transcription by sending audio chunks to the WebSocket server.
@@ -18,9 +15,10 @@ async def test_streaming_transcription(session_id, audio_file_path):
         session_id: The session ID to use
         audio_file_path: Path to the audio file to send
     """
-    # Read the audio file
+    # Read the audio file; a memoryview lets per-chunk slices share the
+    # buffer instead of copying
     with open(audio_file_path, "rb") as f:
-        audio_data = f.read()
+        audio_data = memoryview(f.read())
     
     # Connect to the WebSocket server
     uri = f"ws://localhost:8000/ws/{session_id}"
@@ -40,41 +38,56 @@ async def test_streaming_transcription(session_id, audio_file_path):
         
         print(f"Sending {num_chunks} chunks from {audio_file_path} ({len(audio_data)} bytes)...")
         
-        # Send audio data in chunks
-        for i in range(num_chunks):
-            # Extract chunk
-            start = i * chunk_size
-            end = start + chunk_size
-            chunk = audio_data[start:end]
-            
-            # Send as binary if the server accepts raw PCM
-            await websocket.send(chunk)
-            
-            # Or send as base64 in JSON (uncomment if your server expects this format)
-            # chunk_base64 = base64.b64encode(chunk).decode("utf-8")
-            # message = json.dumps({"audio_data": chunk_base64})
-            # await websocket.send(message)
+        async def producer():
+            """Send chunks paced against a monotonic deadline so sleep
+            drift doesn't accumulate over the run."""
+            loop = asyncio.get_running_loop()
+            next_deadline = loop.time()
+            for i in range(num_chunks):
+                start = i * chunk_size
+                chunk = audio_data[start:start + chunk_size]
+                
+                # Send as binary if the server accepts raw PCM
+                await websocket.send(chunk)
+                
+                # 100ms between chunks to simulate real-time audio
+                next_deadline += 0.1
+                await asyncio.sleep(max(0.0, next_deadline - loop.time()))
             
-            # Sleep to simulate real-time audio (adjust based on your chunk size)
-            await asyncio.sleep(0.1)  # 100ms between chunks
-            
-            # Process any incoming messages
-            while websocket.messages:
-                response = await websocket.recv()
-                print(f"Received: {json.loads(response)}")
+            print("Finished sending audio, waiting for final results...")
         
-        # Wait for final results
-        print("Finished sending audio, waiting for final results...")
-        for _ in range(5):  # Wait for up to 5 seconds for final results
+        async def consumer():
+            """Drain responses as they arrive, concurrently with sending."""
             try:
-                response = await asyncio.wait_for(websocket.recv(), timeout=1.0)
-                print(f"Received: {json.loads(response)}")
-            except asyncio.TimeoutError:
+                async for response in websocket:
+                    print(f"Received: {orjson.loads(response)}")
+            except websockets.exceptions.ConnectionClosed:
                 pass
-            
+        
+        # Run send and receive as a concurrent pipeline instead of
+        # serializing send -> sleep -> drain per chunk
+        recv_task = asyncio.create_task(consumer())
+        await producer()
+        
+        # Allow up to 5 seconds for final results, then stop the consumer
+        try:
+            await asyncio.wait_for(asyncio.shield(recv_task), timeout=5.0)
+        except asyncio.TimeoutError:
+            recv_task.cancel()
+        
         print("Test completed.")
 
 if __name__ == "__main__":
+    # Use uvloop's C event loop when available
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+
+    # Load environment variables only when run as a script
+    load_dotenv()
+
     if len(sys.argv) < 3:
         print("Usage: python test_stream.py <session_id> <audio_file_path>")
         sys.exit(1)
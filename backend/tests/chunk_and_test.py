@@ -1,9 +1,9 @@
 import os
 import base64
 import json
+import subprocess
 import sys
 from pathlib import Path
-from pydub import AudioSegment
 import httpx
 import asyncio
 from loguru import logger
@@ -24,17 +24,26 @@ async def chunk_audio_and_test():
     logger.info(f"Loading audio file: {audio_path}")
     
     try:
-        # Load the MP3 file
-        audio = AudioSegment.from_mp3(audio_path)
-        
-        # Extract a 10-second chunk (start at 5 seconds to avoid any initial silence)
-        chunk_start_ms = 5000  # 5 seconds
-        chunk_end_ms = chunk_start_ms + 10000  # 10 seconds duration
-        audio_chunk = audio[chunk_start_ms:chunk_end_ms]
-        
-        # Save the chunk as WAV (better for transcription)
+        # Extract a 10-second chunk starting at 5 seconds (avoids any initial
+        # silence) as WAV (better for transcription). Input-side -ss seeks
+        # before decoding, so ffmpeg only decodes the 10-second window rather
+        # than pydub's full decode + slice + re-encode of the whole file
         chunk_path = Path(__file__).parent.parent / "audio_chunk_10s.wav"
-        audio_chunk.export(chunk_path, format="wav")
+        subprocess.run(
+            [
+                "ffmpeg",
+                "-ss", "5",
+                "-t", "10",
+                "-i", str(audio_path),
+                "-ac", "1",
+                "-ar", "16000",
+                "-acodec", "pcm_s16le",
+                str(chunk_path),
+                "-y",
+            ],
+            check=True,
+            capture_output=True,
+        )
         logger.info(f"Exported 10-second chunk to {chunk_path}")
         
         # Read the file and convert to base64
@@ -65,14 +74,5 @@ async def chunk_audio_and_test():
         return f"Error: {str(e)}"
 
 if __name__ == "__main__":
-    # Check if pydub is installed
-    try:
-        import pydub
-    except ImportError:
-        print("pydub not found. Installing...")
-        import subprocess
-        subprocess.check_call(["pip", "install", "pydub"])
-        print("pydub installed.")
-    
     # Run the async function
     result = asyncio.run(chunk_audio_and_test()) 
\ No newline at end of file
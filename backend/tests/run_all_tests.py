@@ -15,32 +15,42 @@ if __name__ == "__main__":
 
 from tests.test_store import test_in_memory_store, test_dispatcher
 from tests.test_client import test_websocket
+from app.store.storage import InMemoryTranscriptionStore
+from app.store.dispatcher import TranscriptDispatcher
 # Optional: we don't run these by default as they require audio files and API keys
 # from tests.test_api_endpoint import test_transcription_api
 # from tests.chunk_and_test import chunk_audio_and_test
 
 async def run_all_tests():
-    """Run all the tests sequentially."""
+    """Run all the tests concurrently."""
     print("\n" + "="*50)
     print("RUNNING ALL TESTS")
     print("="*50)
     
-    # Test the in-memory store
-    print("\nRunning in-memory store tests...")
-    await test_in_memory_store()
+    # Give the store and dispatcher tests isolated instances instead of
+    # the process-wide singletons (the WebSocket test talks to a separate
+    # server), so running them concurrently can't interleave state: wall
+    # time becomes the max of the three, not the sum
+    store = InMemoryTranscriptionStore()
+    dispatcher_store = InMemoryTranscriptionStore()
+    dispatcher = TranscriptDispatcher(store=dispatcher_store)
     
-    # Test the dispatcher
-    print("\nRunning dispatcher tests...")
-    await test_dispatcher()
+    print("\nRunning store, dispatcher and WebSocket API tests concurrently...")
+    print("(The WebSocket test requires the server to be running)")
+    results = await asyncio.gather(
+        test_in_memory_store(store),
+        test_dispatcher(dispatcher, dispatcher_store),
+        asyncio.wait_for(test_websocket(), timeout=15),
+        return_exceptions=True,
+    )
     
-    # Test the WebSocket API (uncomment if you have the server running)
-    try:
-        print("\nRunning WebSocket API tests...")
-        print("(This test requires the server to be running)")
-        print("If you don't have the server running, press Ctrl+C to skip")
-        await asyncio.wait_for(test_websocket(), timeout=15)
-    except (asyncio.TimeoutError, KeyboardInterrupt, ConnectionRefusedError):
-        print("WebSocket test skipped or timed out.")
+    for name, result in zip(
+        ("in-memory store", "dispatcher", "WebSocket API"), results
+    ):
+        if isinstance(result, (asyncio.TimeoutError, ConnectionRefusedError, OSError)):
+            print(f"{name} test skipped or timed out: {result!r}")
+        elif isinstance(result, BaseException):
+            print(f"{name} test failed: {result!r}")
     
     # These tests are optional and not run by default as they require audio files and API keys
     # print("\nRunning API transcription test...")
@@ -7,7 +7,7 @@ Usage:
 """
 
 import asyncio
-import json
+import orjson
 import uuid
 import base64
 import sys
@@ -45,11 +45,11 @@ async def test_websocket():
             
             # Send the message
             print(f"Sending chunk {i}...")
-            await websocket.send(json.dumps(message))
+            await websocket.send(orjson.dumps(message).decode())
             
             # Receive the response
             response = await websocket.recv()
-            response_data = json.loads(response)
+            response_data = orjson.loads(response)
             print(f"Received response for chunk {i}: {response_data}")
             
             # Wait a bit between messages
@@ -59,4 +59,11 @@ async def test_websocket():
 
 
 if __name__ == "__main__":
+    # Use uvloop's C event loop when available
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+
     asyncio.run(test_websocket()) 
\ No newline at end of file
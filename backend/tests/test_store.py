@@ -14,17 +14,19 @@ if __name__ == "__main__":
 from app.store.storage import get_transcript_store
 from app.store.dispatcher import get_dispatcher
 
-async def test_in_memory_store():
+async def test_in_memory_store(store=None):
     """Test the in-memory transcript store functionality."""
     print("\n=== Testing In-Memory Transcript Store ===")
     
-    # Get the store instance
-    store = get_transcript_store()
+    if store is None:
+        store = get_transcript_store()
     
-    # Add some test transcripts
-    await store.add_transcript('test_session', 1, 'Test transcript 1')
-    await store.add_transcript('test_session', 2, 'Test transcript 2')
-    await store.add_transcript('another_session', 1, 'Another session transcript')
+    # Add some test transcripts in one batch (one lock acquisition per shard)
+    await store.add_transcripts([
+        ('test_session', 1, 'Test transcript 1'),
+        ('test_session', 2, 'Test transcript 2'),
+        ('another_session', 1, 'Another session transcript'),
+    ])
     
     # Get pending transcripts
     pending = await store.get_pending_transcripts()
@@ -48,27 +50,29 @@ async def test_in_memory_store():
     
     return True
 
-async def test_dispatcher():
+async def test_dispatcher(dispatcher=None, store=None):
     """Test the transcript dispatcher functionality."""
     print("\n=== Testing Transcript Dispatcher ===")
     
-    # Get the dispatcher instance
-    dispatcher = get_dispatcher()
+    if dispatcher is None:
+        dispatcher = get_dispatcher()
     
     # Configure it for faster testing
     dispatcher.interval_seconds = 2
     dispatcher.batch_size = 5
     
+    # Drain everything pending deterministically before exercising the
+    # background loop
+    flushed = await dispatcher.flush_once()
+    print(f"Dispatcher flushed {flushed} transcripts")
+    
     # Start the dispatcher
     print("Starting dispatcher...")
     await dispatcher.start()
     
-    # Wait a moment for the dispatcher to process
-    print("Waiting for dispatcher to process...")
-    await asyncio.sleep(3)
-    
     # Check if any transcripts were dispatched
-    store = get_transcript_store()
+    if store is None:
+        store = get_transcript_store()
     pending = await store.get_pending_transcripts()
     print(f'Pending transcripts after dispatcher run: {len(pending)}')
     
@@ -80,9 +84,19 @@ async def test_dispatcher():
 
 async def main():
     """Run all tests."""
-    await test_in_memory_store()
-    await test_dispatcher()
+    # Resolve the singletons once and pass them down
+    store = get_transcript_store()
+    dispatcher = get_dispatcher()
+    await test_in_memory_store(store)
+    await test_dispatcher(dispatcher, store)
     print("\nAll tests completed!")
 
 if __name__ == "__main__":
+    # Use uvloop's C event loop when available
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+
     asyncio.run(main()) 
\ No newline at end of file
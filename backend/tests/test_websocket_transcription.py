@@ -17,14 +17,16 @@ Usage:
 import asyncio
 import sys
 import os
-import json
 import uuid
-import base64
+import struct
+import subprocess
 import time
+from array import array
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+import orjson
 import sqlalchemy as sa
 import websockets
-from pydub import AudioSegment
 from loguru import logger
 import httpx
 
@@ -46,14 +48,40 @@ AUDIO_PATH = Path(__file__).parent.parent / "aws-bp-30 (1).mp3"
 CHUNK_LENGTH_MS = 5000  # 5 seconds per chunk
 MAX_DURATION_MS = 20000  # Process the first 20 seconds of audio
 LOG_FILE = Path(__file__).parent.parent / "websocket_test.log"
-# Time to wait for background SOAP note generation after WebSocket closes
+# Deadline for background SOAP note generation after WebSocket closes
 SOAP_GENERATION_WAIT_TIME = 10  # seconds
+# Deadline for the dispatcher to flush transcripts to the database
+DB_FLUSH_WAIT_TIME = 10  # seconds
+# Deadline for all chunk responses to arrive after the last send
+RESPONSE_WAIT_TIME = 30  # seconds
+# Concurrent WebSocket connections to spread the chunks over
+NUM_CONNECTIONS = int(os.environ.get("TEST_WS_CONNECTIONS", "1"))
+
+# One AsyncSession is shared across the verification helpers; it is not
+# safe for concurrent use and they run in parallel, so serialize access
+DB_LOCK = asyncio.Lock()
 
 # Configure logger
 logger.remove()  # Remove default handlers
 logger.add(LOG_FILE, rotation="1 MB", level="INFO")
 logger.add(sys.stdout, level="INFO")  # Also log to console
 
+def encode_chunk(pcm_bytes: bytes, sample_rate: int, channels: int, sample_width: int) -> bytes:
+    """Frame one PCM slice as WAV (runs in a worker process)."""
+    return make_wav_header(len(pcm_bytes), sample_rate, channels, sample_width) + pcm_bytes
+
+def make_wav_header(n_bytes: int, sample_rate: int, channels: int, sample_width: int) -> bytes:
+    """Build a 44-byte PCM WAV (RIFF) header for a payload of n_bytes."""
+    byte_rate = sample_rate * channels * sample_width
+    block_align = channels * sample_width
+    return struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF", 36 + n_bytes, b"WAVE",
+        b"fmt ", 16, 1, channels, sample_rate, byte_rate, block_align,
+        sample_width * 8,
+        b"data", n_bytes,
+    )
+
 async def chunk_audio(audio_path: Path, chunk_length_ms: int, max_duration_ms: int):
     """
     Load an audio file and split it into chunks of specified length.
@@ -64,108 +92,195 @@ async def chunk_audio(audio_path: Path, chunk_length_ms: int, max_duration_ms: i
         max_duration_ms: Maximum duration to process from the start
         
     Returns:
-        List of (chunk_number, base64_encoded_audio_data) tuples
+        List of (chunk_number, wire_frame) tuples, where wire_frame is a
+        memoryview over the frame's bytes (serial header included)
     """
     logger.info(f"Loading audio file: {audio_path}")
     
-    # Load the audio file
-    audio = AudioSegment.from_mp3(audio_path)
+    # Decode only the first max_duration_ms straight to raw PCM on stdout
+    # (output-side -t stops ffmpeg once the window is filled); pydub's
+    # from_mp3 would decode the whole file just to slice off 20 seconds.
+    # 16 kHz mono s16le matches what chunk_and_test.py feeds the
+    # transcription services
+    frame_rate, channels, sample_width = 16000, 1, 2
+    frame_width = channels * sample_width
+    proc = subprocess.run(
+        [
+            "ffmpeg",
+            "-t", f"{max_duration_ms / 1000:.3f}",
+            "-i", str(audio_path),
+            "-ac", str(channels),
+            "-ar", str(frame_rate),
+            "-acodec", "pcm_s16le",
+            "-f", "s16le",
+            "pipe:1",
+        ],
+        check=True,
+        capture_output=True,
+    )
+    pcm = memoryview(proc.stdout)
     
-    # Calculate the number of chunks
-    duration_ms = min(len(audio), max_duration_ms)
+    # Calculate the number of chunks from what was actually decoded
+    duration_ms = min(len(pcm) // frame_width * 1000 // frame_rate, max_duration_ms)
     num_chunks = (duration_ms + chunk_length_ms - 1) // chunk_length_ms
     
     logger.info(f"Processing {duration_ms/1000:.1f} seconds of audio in {num_chunks} chunks")
     
-    # Create chunks
-    chunks = []
+    # Slice the PCM buffer per chunk (frame-aligned byte offsets)
+    pcm_slices = []
     for i in range(num_chunks):
         chunk_start = i * chunk_length_ms
         chunk_end = min(chunk_start + chunk_length_ms, duration_ms)
-        
-        # Extract the chunk
-        audio_chunk = audio[chunk_start:chunk_end]
-        
-        # Export to in-memory WAV
-        wav_data = audio_chunk.export(format="wav").read()
-        
-        # Base64 encode the WAV data
-        base64_data = base64.b64encode(wav_data).decode("utf-8")
-        
-        # Add to list of chunks with chunk number (serial)
-        chunks.append((i + 1, base64_data))
-        
+        start_byte = (chunk_start * frame_rate // 1000) * frame_width
+        end_byte = (chunk_end * frame_rate // 1000) * frame_width
+        pcm_slices.append(bytes(pcm[start_byte:end_byte]))
         logger.debug(f"Created chunk {i+1}: {chunk_start/1000:.1f}s - {chunk_end/1000:.1f}s")
     
-    return chunks
+    # WAV framing is pure CPU work, so fan it out
+    # across worker processes instead of serializing it under the GIL
+    loop = asyncio.get_running_loop()
+    with ProcessPoolExecutor(max_workers=min(os.cpu_count() or 1, num_chunks)) as executor:
+        encoded = await asyncio.gather(*(
+            loop.run_in_executor(
+                executor, encode_chunk,
+                pcm_bytes, frame_rate, channels, sample_width,
+            )
+            for pcm_bytes in pcm_slices
+        ))
+    
+    # Pack every wire frame (4-byte serial header + WAV bytes) into one
+    # contiguous buffer with an offset index; the sender then transmits
+    # zero-copy memoryview slices instead of building a fresh
+    # header+payload bytes object per chunk
+    buf = bytearray()
+    offsets = array("Q", [0])
+    for serial, wav_data in enumerate(encoded, start=1):
+        buf += struct.pack(">I", serial)
+        buf += wav_data
+        offsets.append(len(buf))
+    frames = memoryview(buf)
+    
+    return [(i + 1, frames[offsets[i]:offsets[i + 1]]) for i in range(num_chunks)]
 
-async def send_chunks_to_websocket(session_id: str, chunks):
+async def send_chunks_to_websocket(session_id: str, chunks, num_connections: int = None):
     """
     Send audio chunks to the WebSocket endpoint.
-    
+
     Args:
         session_id: Session identifier
-        chunks: List of (chunk_number, base64_encoded_audio_data) tuples
-    
+        chunks: List of (chunk_number, wire_frame) tuples
+        num_connections: Number of concurrent WebSocket connections to
+            spread the chunks over (defaults to NUM_CONNECTIONS)
+
     Returns:
         Dictionary of transcription results by chunk number
     """
+    if num_connections is None:
+        num_connections = NUM_CONNECTIONS
     websocket_url = f"{WEBSOCKET_URL}{session_id}"
-    logger.info(f"Connecting to WebSocket: {websocket_url}")
-    
+    logger.info(f"Connecting to WebSocket: {websocket_url} ({num_connections} connection(s))")
+
     results = {}
-    
-    try:
-        async with websockets.connect(websocket_url) as websocket:
+
+    async def run_connection(conn_chunks):
+        """Send one slice of chunks over its own connection."""
+        # permessage-deflate would zlib every WAV frame for no real size
+        # win; raise max_size so large chunks fit in one frame
+        async with websockets.connect(
+            websocket_url, compression=None, max_size=10 * 1024 * 1024
+        ) as websocket:
             logger.info(f"Connected to session {session_id}")
-            
+
             # Tell the server to use the "mock" SOAP processor for testing
-            await websocket.send(json.dumps({
+            # (decoded to str so it goes out as a text frame, which is how
+            # the server recognizes JSON control messages)
+            await websocket.send(orjson.dumps({
                 "set_soap_processor": "mock"
-            }))
-            
-            for serial, audio_data in chunks:
-                # Prepare the message
-                message = {
-                    "serial": serial,
-                    "audio_data": audio_data,
-                    # Using default provider from server settings
-                }
-                
-                # Send the chunk
-                logger.info(f"Sending chunk {serial} to server...")
-                await websocket.send(json.dumps(message))
-                
-                # Wait for the response
-                response = await websocket.recv()
-                response_data = json.loads(response)
-                
-                if response_data.get("status") == "success":
+            }).decode())
+
+            # Decouple the socket from response handling with a queue: the
+            # reader task is always parked on recv(), so the server's
+            # responses drain as fast as they arrive even while earlier
+            # ones are still being processed
+            responses = asyncio.Queue()
+
+            async def reader():
+                """Park on recv(), pushing every parsed response to the queue."""
+                try:
+                    async for raw in websocket:
+                        responses.put_nowait(orjson.loads(raw))
+                except websockets.exceptions.ConnectionClosed:
+                    pass
+                finally:
+                    # Sentinel so the drain loop wakes up (rather than
+                    # hanging) if the connection closes early
+                    responses.put_nowait(None)
+
+            async def writer():
+                """Push all chunks back-to-back without waiting for replies."""
+                for serial, frame in conn_chunks:
+                    logger.info(f"Sending chunk {serial} to server...")
+                    # Binary frame: 4-byte big-endian serial + raw WAV bytes,
+                    # already packed contiguously by chunk_audio
+                    await websocket.send(frame)
+
+            # Pipeline sends and receives instead of paying a full round-trip
+            # (plus a 100ms pause) per chunk
+            reader_task = asyncio.create_task(reader())
+            await writer()
+
+            # Drain until every chunk is answered (errors count too) or
+            # the deadline passes; both failure modes end the loop instead
+            # of hanging on an empty queue
+            received = 0
+            deadline = time.monotonic() + RESPONSE_WAIT_TIME
+            while received < len(conn_chunks):
+                try:
+                    response_data = await asyncio.wait_for(
+                        responses.get(), timeout=max(0.0, deadline - time.monotonic())
+                    )
+                except asyncio.TimeoutError:
+                    logger.error(
+                        f"Timed out after {received}/{len(conn_chunks)} chunk responses"
+                    )
+                    break
+                if response_data is None:
+                    logger.error(
+                        f"Connection closed after {received}/{len(conn_chunks)} chunk responses"
+                    )
+                    break
+                serial = response_data.get("serial")
+
+                if response_data.get("status") == "success" and serial is not None:
                     transcript = response_data.get("transcript", "")
                     logger.info(f"Received transcript for chunk {serial}: {transcript[:50]}...")
                     results[serial] = transcript
-                else:
-                    logger.error(f"Error processing chunk {serial}: {response_data}")
-                
-                # Brief pause to avoid overloading
-                await asyncio.sleep(0.1)
-        
+                    received += 1
+                elif response_data.get("status") == "error":
+                    logger.error(f"Error response from server: {response_data}")
+                    received += 1
+
+            reader_task.cancel()
+
+    try:
+        # Round-robin the chunks over the connections; server-side
+        # transcription of different chunks then overlaps
+        slices = [chunks[i::num_connections] for i in range(num_connections)]
+        await asyncio.gather(*(run_connection(s) for s in slices if s))
+
         logger.info(f"WebSocket connection closed normally for session {session_id}")
-        logger.info(f"Waiting {SOAP_GENERATION_WAIT_TIME} seconds for background SOAP note generation...")
-        
-        # Wait for the background SOAP note generation to complete
-        await asyncio.sleep(SOAP_GENERATION_WAIT_TIME)
-                
+
     except Exception as e:
         logger.exception(f"WebSocket error: {e}")
-    
+
     return results
 
-async def verify_database_records(session_id: str, expected_chunk_count: int):
+async def verify_database_records(db, session_id: str, expected_chunk_count: int):
     """
     Verify that transcripts were properly stored in the database.
     
     Args:
+        db: Shared AsyncSession (guarded by DB_LOCK)
         session_id: Session identifier
         expected_chunk_count: Expected number of chunks
         
@@ -174,26 +289,41 @@ async def verify_database_records(session_id: str, expected_chunk_count: int):
     """
     logger.info(f"Verifying database records for session {session_id}...")
     
-    # Wait a moment to allow dispatcher to finish processing
-    await asyncio.sleep(6)  # Giving the dispatcher time to process
-    
     try:
-        async with async_session() as session:
-            # Query the database for transcripts from this session
-            result = await session.execute(
-                sa.select(Transcript)
+        # Poll for the dispatcher flush instead of sleeping a fixed interval:
+        # the test proceeds the moment the rows land
+        deadline = time.monotonic() + DB_FLUSH_WAIT_TIME
+        while True:
+            async with DB_LOCK:
+                count = (await db.execute(
+                    sa.select(sa.func.count())
+                    .select_from(Transcript)
+                    .where(Transcript.session_id == session_id)
+                )).scalar_one()
+                # End the implicit transaction so the next probe sees rows
+                # committed after it started
+                await db.rollback()
+            if count >= expected_chunk_count or time.monotonic() >= deadline:
+                break
+            await asyncio.sleep(0.25)
+        
+        async with DB_LOCK:
+            # Fetch only the two columns the test needs as plain tuples;
+            # full ORM rows would pay identity-map and attribute
+            # instrumentation for data we immediately flatten into a dict
+            result = await db.execute(
+                sa.select(Transcript.serial, Transcript.transcript)
                 .where(Transcript.session_id == session_id)
                 .order_by(Transcript.serial)
             )
-            db_records = result.scalars().all()
+            db_transcripts = dict(result.all())
+            await db.rollback()
             
-        logger.info(f"Found {len(db_records)} records in database out of {expected_chunk_count} expected")
-        
-        # Convert to dictionary by serial number
-        db_transcripts = {record.serial: record.transcript for record in db_records}
+        logger.info(f"Found {len(db_transcripts)} records in database out of {expected_chunk_count} expected")
         
-        # Check if we got all the expected records
-        missing_serials = [i for i in range(1, expected_chunk_count + 1) if i not in db_transcripts]
+        # Check if we got all the expected records; one C-level set
+        # difference instead of a membership probe per serial
+        missing_serials = sorted(set(range(1, expected_chunk_count + 1)) - db_transcripts.keys())
         if missing_serials:
             logger.warning(f"Missing {len(missing_serials)} records in database: {missing_serials}")
         
@@ -203,53 +333,76 @@ async def verify_database_records(session_id: str, expected_chunk_count: int):
         logger.exception(f"Database verification error: {e}")
         return {}
 
-async def check_soap_note_generation(session_id: str):
+async def check_soap_note_generation(db, session_id: str, client: httpx.AsyncClient):
     """
     Check if a SOAP note was generated for the session.
     
     This function uses both the REST API and direct database access to check.
     
     Args:
+        db: Shared AsyncSession (guarded by DB_LOCK)
         session_id: Session identifier
+        client: Shared HTTP client for the REST API checks
         
     Returns:
         Tuple of (soap_note_exists, soap_note_text)
     """
     logger.info(f"Checking for SOAP note generation for session {session_id}...")
     
-    # First try the REST API
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f"{API_BASE_URL}/sessions/{session_id}/soap")
-            
-            if response.status_code == 200:
-                soap_data = response.json()
-                logger.info(f"SOAP note found via API for session {session_id}")
-                return True, soap_data.get("soap_text", "")
-            else:
+    deadline = time.monotonic() + SOAP_GENERATION_WAIT_TIME
+    
+    async def check_via_api():
+        """Poll the REST endpoint until the note appears or the deadline passes."""
+        while True:
+            try:
+                response = await client.get(f"/sessions/{session_id}/soap")
+                if response.status_code == 200:
+                    logger.info(f"SOAP note found via API for session {session_id}")
+                    return True, response.json().get("soap_text", "")
+            except Exception as e:
+                logger.error(f"Error checking SOAP note via API: {e}")
+                return None
+            if time.monotonic() >= deadline:
                 logger.warning(f"No SOAP note found via API for session {session_id}: {response.status_code}")
-    except Exception as e:
-        logger.error(f"Error checking SOAP note via API: {e}")
+                return None
+            await asyncio.sleep(0.1)
     
-    # If API check failed, try direct database access
-    try:
-        async with async_session() as session:
-            result = await session.execute(
-                sa.select(SOAPNote)
-                .where(SOAPNote.session_id == session_id)
-                .order_by(SOAPNote.created_at.desc())
-            )
-            soap_note = result.scalars().first()
-            
-            if soap_note:
-                logger.info(f"SOAP note found in database for session {session_id}")
-                return True, soap_note.soap_text
-            else:
+    async def check_via_db():
+        """Poll the database directly until the note appears or the deadline passes."""
+        while True:
+            try:
+                async with DB_LOCK:
+                    result = await db.execute(
+                        sa.select(SOAPNote.soap_text)
+                        .where(SOAPNote.session_id == session_id)
+                        .order_by(SOAPNote.created_at.desc())
+                    )
+                    soap_text = result.scalars().first()
+                    await db.rollback()
+                if soap_text is not None:
+                    logger.info(f"SOAP note found in database for session {session_id}")
+                    return True, soap_text
+            except Exception as e:
+                logger.exception(f"Database SOAP note check error: {e}")
+                return None
+            if time.monotonic() >= deadline:
                 logger.warning(f"No SOAP note found in database for session {session_id}")
-                return False, ""
-    except Exception as e:
-        logger.exception(f"Database SOAP note check error: {e}")
-        return False, ""
+                return None
+            await asyncio.sleep(0.25)
+    
+    # Race the API and DB paths instead of trying them in sequence:
+    # whichever finds the note first wins and the loser is cancelled
+    pending = {asyncio.create_task(check_via_api()), asyncio.create_task(check_via_db())}
+    found = None
+    while pending and found is None:
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            if task.result() is not None:
+                found = task.result()
+    for task in pending:
+        task.cancel()
+    
+    return found if found is not None else (False, "")
 
 async def main():
     """Main test function."""
@@ -269,11 +422,17 @@ async def main():
         elapsed_time = time.time() - start_time
         logger.info(f"WebSocket processing completed in {elapsed_time:.2f} seconds")
         
-        # Step 3: Verify database records
-        db_transcripts = await verify_database_records(session_id, len(chunks))
-        
-        # Step 4: Check for SOAP note generation
-        soap_generated, soap_text = await check_soap_note_generation(session_id)
+        # Steps 3 and 4: verify database records and poll for the SOAP
+        # note concurrently, so the wall time is the max of the two waits
+        # rather than their sum. One shared keep-alive client serves the
+        # whole SOAP poll loop, and one pooled DB session serves every probe
+        async with httpx.AsyncClient(base_url=API_BASE_URL, http2=True, timeout=5.0) as client, \
+                async_session() as db:
+            async with asyncio.TaskGroup() as tg:
+                db_task = tg.create_task(verify_database_records(db, session_id, len(chunks)))
+                soap_task = tg.create_task(check_soap_note_generation(db, session_id, client))
+        db_transcripts = db_task.result()
+        soap_generated, soap_text = soap_task.result()
         
         # Step 5: Report results
         logger.info("\n" + "="*50)
@@ -310,4 +469,11 @@ async def main():
         logger.exception(f"Test failed: {e}")
 
 if __name__ == "__main__":
+    # Use uvloop's C event loop when available
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+
     asyncio.run(main()) 
\ No newline at end of file